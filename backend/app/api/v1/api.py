@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, products, sales, forecasts, alerts
+from app.api.v1.endpoints import auth, products, sales, forecasts, alerts, dashboard, inventory, pipeline, events
 
 api_router = APIRouter()
 
@@ -9,3 +9,7 @@ api_router.include_router(sales.router, prefix="/sales", tags=["sales"])
 api_router.include_router(forecasts.router, prefix="/forecasts", tags=["forecasts"])
 api_router.include_router(alerts.router, prefix="/alerts", tags=["alerts"])
 
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
+api_router.include_router(pipeline.router, prefix="/pipeline", tags=["pipeline"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
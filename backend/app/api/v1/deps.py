@@ -1,36 +1,75 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Generator, Optional
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db, get_async_db, get_read_db, get_read_async_db
 from app.core.config import settings
-from app.core.security import verify_password
+from app.core.security import EVENT_STREAM_SCOPE, verify_password
 from app.db.models.user import User
 from app.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _get_token_subject(token: str, scope: Optional[str] = None) -> int:
+    """
+    Decode a bearer token and return the user ID it was issued for. The
+    token's scope must match: None for regular access tokens.
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-        if token_data.sub is None:
+        if token_data.sub is None or token_data.scope != scope:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    return token_data.sub
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    user_id = _get_token_subject(token)
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        raise credentials_exception
+    return user
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_read_async_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Resolve the user through the read session, which FastAPI shares with a
+    read endpoint's own, so a replica read checks out no primary connection
+    """
+    user_id = _get_token_subject(token)
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if user is None:
+        raise credentials_exception
+    return user
+
+async def get_current_user_from_stream_token(
+    token: str = Query(..., description="Event stream token from POST /events/token"),
+) -> User:
+    """
+    Authenticate with a short-lived event stream token as a query parameter,
+    for clients that cannot set headers (EventSource). Access tokens are
+    refused here so they never end up in URLs and access logs. The session
+    is closed before returning so long-lived responses do not hold a connection.
+    """
+    user_id = _get_token_subject(token, scope=EVENT_STREAM_SCOPE)
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise credentials_exception
     return user
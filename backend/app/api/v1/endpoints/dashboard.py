@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+
+from app.api.v1.deps import get_read_async_db, get_current_user_async
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.dashboard import DashboardSummary
+from app.db.models.alert import OPEN_ALERT_STATUSES, StockAlert
+from app.db.models.product import Product
+from app.db.models.user import User
+from app.services.demand import forecast_demand, planning_params
+
+router = APIRouter()
+
+# Summaries are shared by every dashboard, so a short TTL absorbs bursts of page loads
+_summary_cache = TTLCache(ttl=settings.DASHBOARD_CACHE_SECONDS)
+
+@router.get("/", response_model=DashboardSummary)
+async def get_dashboard(
+    db: AsyncSession = Depends(get_read_async_db),
+    horizon_days: Optional[int] = Query(None, ge=1, le=365),
+    category: Optional[str] = None,
+    current_user: User = Depends(get_current_user_async),
+) -> DashboardSummary:
+    """
+    Get stock level, forecast total over the horizon, days of cover and
+    open alert count for every product in a single call. Without
+    horizon_days each product uses its own or its category's alert horizon.
+    """
+    cache_key = (horizon_days, category)
+    cached = _summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    alert_counts = (
+        select(StockAlert.product_id, func.count(StockAlert.id).label("open_alerts"))
+        .where(StockAlert.status.in_(OPEN_ALERT_STATUSES))
+        .group_by(StockAlert.product_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Product.id,
+            Product.name,
+            Product.category,
+            Product.stock_level,
+            Product.reorder_threshold,
+            func.coalesce(alert_counts.c.open_alerts, 0),
+        )
+        .outerjoin(alert_counts, alert_counts.c.product_id == Product.id)
+        .order_by(Product.id)
+    )
+    if category:
+        query = query.where(Product.category == category)
+
+    rows = (await db.execute(query)).all()
+    product_ids = [row[0] for row in rows]
+
+    def product_demand(session: Session):
+        if horizon_days is not None:
+            horizons = dict.fromkeys(product_ids, horizon_days)
+        else:
+            horizons = {product_id: horizon for product_id, (horizon, _) in planning_params(session, product_ids).items()}
+        return horizons, forecast_demand(session, horizons)
+
+    # Forecast totals come from the cumulative columns: two rows per product whatever the horizon
+    horizons, demand = await db.run_sync(product_demand)
+
+    products = []
+    for product_id, name, product_category, stock_level, reorder_threshold, open_alerts in rows:
+        forecast_total = demand.get(product_id) or 0.0
+        daily_demand = forecast_total / horizons[product_id]
+        products.append({
+            "product_id": product_id,
+            "name": name,
+            "category": product_category,
+            "stock_level": stock_level or 0,
+            "reorder_threshold": reorder_threshold or 0,
+            "horizon_days": horizons[product_id],
+            "forecast_total": round(forecast_total, 2),
+            # No forecast demand means stock never runs out within the forecast
+            "days_of_cover": round((stock_level or 0) / daily_demand, 1) if daily_demand > 0 else None,
+            "open_alerts": open_alerts,
+        })
+
+    summary = {
+        "horizon_days": horizon_days,
+        "generated_at": datetime.now(),
+        "products": products,
+    }
+    _summary_cache.set(cache_key, summary)
+    return summary
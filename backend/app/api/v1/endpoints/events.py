@@ -0,0 +1,46 @@
+from datetime import timedelta
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from app.api.v1.deps import get_current_user, get_current_user_from_stream_token
+from app.core.broadcast import broadcaster
+from app.core.config import settings
+from app.core.security import EVENT_STREAM_SCOPE, create_access_token
+from app.db.models.user import User
+from app.schemas.token import StreamToken
+
+router = APIRouter()
+
+@router.post("/token", response_model=StreamToken)
+def create_stream_token(
+    current_user: User = Depends(get_current_user),
+) -> StreamToken:
+    """
+    Issue a short-lived token that only opens the event stream. EventSource
+    cannot send an Authorization header, so the stream takes this token on
+    its URL instead of the access token. Fetch a new one before each connect.
+    """
+    token = create_access_token(
+        subject=current_user.id,
+        expires_delta=timedelta(seconds=settings.SSE_TOKEN_EXPIRE_SECONDS),
+        scope=EVENT_STREAM_SCOPE,
+    )
+    return {"token": token, "expires_in": settings.SSE_TOKEN_EXPIRE_SECONDS}
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_events(
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_from_stream_token),
+) -> StreamingResponse:
+    """
+    Server-sent events: new stock alerts (alerts_changed), forecast job
+    progress (forecast_progress) and ingest pipeline progress
+    (pipeline_progress). Pass a token from POST /events/token as ?token=;
+    reconnecting clients send Last-Event-ID to replay the events they missed.
+    """
+    return StreamingResponse(
+        broadcaster.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
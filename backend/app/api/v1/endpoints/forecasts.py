@@ -1,81 +1,185 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from datetime import date
 import json
 import os
 import sys
-import pandas as pd
-from prophet import Prophet
+import time
+import uuid
 
 # Add project root to path to import our custom modules
 sys.path.append("/home/ubuntu/Resupply-forecast-app")
 
-from app.api.v1.deps import get_db, get_current_user
-from app.schemas.forecast import Forecast, ForecastGenerate
-from app.db.models.forecast import Forecast as ForecastModel
+from app.api.v1.deps import get_db, get_read_db, get_read_async_db, get_current_user, get_current_user_async
+from app.core.config import settings
+from app.core.events import FORECAST_PROGRESS, event_bus
+from app.core.responses import ResponseFormat, columnar_response
+from app.schemas.forecast import Forecast, ForecastGenerate, BacktestRequest, BacktestScorecard
+from app.db.models.forecast import Forecast as ForecastModel, LatestForecast, latest_forecasts
 from app.db.models.user import User
+from app.services.backtest import BacktestService
+from app.services.engines import get_engine
 from app.services.forecast import ForecastService
 
 router = APIRouter()
 
-def run_forecast_generation(db: Session, product_ids: Optional[List[int]], periods: int, frequency: str):
+# Fields of the Forecast schema, selected as plain columns for the columnar format
+FORECAST_COLUMNS = (
+    ForecastModel.id,
+    ForecastModel.product_id,
+    ForecastModel.date,
+    ForecastModel.predicted_qty,
+    ForecastModel.lower_bound,
+    ForecastModel.upper_bound,
+)
+
+def _progress_publisher(job_id: str):
+    """Progress callback publishing forecast_progress events, at most one per PROGRESS_EVENT_INTERVAL_SECONDS"""
+    last_published = 0.0
+
+    def publish(done: int, total: Optional[int]) -> None:
+        nonlocal last_published
+        now = time.monotonic()
+        if now - last_published >= settings.PROGRESS_EVENT_INTERVAL_SECONDS:
+            last_published = now
+            event_bus.publish(FORECAST_PROGRESS, job_id=job_id, status="running", done=done, total=total)
+
+    return publish
+
+def run_forecast_generation(db: Session, forecast_params: ForecastGenerate, job_id: Optional[str] = None):
     """Helper function to run forecast generation in the background."""
-    forecast_service = ForecastService(db)
+    job_id = job_id or uuid.uuid4().hex
+    on_progress = _progress_publisher(job_id)
+    event_bus.publish(FORECAST_PROGRESS, job_id=job_id, status="started", done=0, total=None)
     try:
-        results = forecast_service.generate_and_save_forecasts(
-            product_ids=product_ids,
-            periods=periods,
-            frequency=frequency
+        forecast_service = ForecastService(
+            db,
+            interval_mode=forecast_params.interval_mode,
+            uncertainty_samples=forecast_params.uncertainty_samples,
         )
+        if forecast_params.mode == "hierarchical":
+            results = forecast_service.generate_hierarchical_forecasts(
+                categories=forecast_params.categories,
+                periods=forecast_params.periods,
+                frequency=forecast_params.frequency,
+                reconcile_top_n=forecast_params.reconcile_top_n,
+            )
+        elif forecast_params.stream:
+            summary = forecast_service.stream_forecasts(
+                product_ids=forecast_params.product_ids,
+                periods=forecast_params.periods,
+                frequency=forecast_params.frequency,
+                changed_only=forecast_params.changed_only,
+                on_progress=on_progress,
+            )
+            print(
+                f"Background forecast generation complete for {summary['forecasted']} of "
+                f"{summary['products']} products in {summary['chunks']} chunks "
+                f"(peak RSS {summary['peak_rss_mb']} MB)."
+            )
+            event_bus.publish(
+                FORECAST_PROGRESS,
+                job_id=job_id,
+                status="completed",
+                done=summary["products"],
+                total=summary["products"],
+                forecasted=summary["forecasted"],
+            )
+            return
+        else:
+            results = forecast_service.generate_and_save_forecasts(
+                product_ids=forecast_params.product_ids,
+                periods=forecast_params.periods,
+                frequency=forecast_params.frequency,
+                changed_only=forecast_params.changed_only,
+                on_progress=on_progress,
+            )
         print(f"Background forecast generation complete for {len(results)} products.")
+        event_bus.publish(
+            FORECAST_PROGRESS,
+            job_id=job_id,
+            status="completed",
+            done=len(results),
+            total=len(results),
+            forecasted=len(results),
+        )
     except Exception as e:
         print(f"Error during background forecast generation: {e}")
+        event_bus.publish(FORECAST_PROGRESS, job_id=job_id, status="failed", error=str(e))
         # Add more robust error logging/handling here
 
+def run_backtest(db: Session, backtest_params: BacktestRequest):
+    """Helper function to run backtesting in the background."""
+    try:
+        metrics = BacktestService(db).run(
+            product_ids=backtest_params.product_ids,
+            engines=backtest_params.engines,
+            horizon=backtest_params.horizon,
+            max_folds=backtest_params.max_folds,
+        )
+        print(f"Backtest complete: {len(metrics)} product/engine scores stored.")
+    except Exception as e:
+        print(f"Error during backtest: {e}")
+
 @router.get("/", response_model=List[Forecast])
-def get_forecasts(
-    db: Session = Depends(get_db),
+async def get_forecasts(
+    db: AsyncSession = Depends(get_read_async_db),
     skip: int = 0,
     limit: int = 100,
     product_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    current_user: User = Depends(get_current_user),
+    response_format: ResponseFormat = Query("rows", alias="format"),
+    current_user: User = Depends(get_current_user_async),
 ) -> List[Forecast]:
     """
-    Get forecasts with optional filtering
+    Get the latest forecasts with optional filtering.
+    format=columnar returns one array per field instead of a list of objects.
     """
-    query = db.query(ForecastModel)
+    columnar = response_format == "columnar"
+    query = latest_forecasts(*FORECAST_COLUMNS) if columnar else latest_forecasts()
     
     if product_id:
-        query = query.filter(ForecastModel.product_id == product_id)
+        query = query.where(LatestForecast.product_id == product_id)
     if start_date:
-        query = query.filter(ForecastModel.date >= start_date)
+        query = query.where(ForecastModel.date >= start_date)
     if end_date:
-        query = query.filter(ForecastModel.date <= end_date)
+        query = query.where(ForecastModel.date <= end_date)
     
-    return query.order_by(ForecastModel.date).offset(skip).limit(limit).all()
+    query = query.order_by(ForecastModel.date).offset(skip).limit(limit)
+    if columnar:
+        return columnar_response((await db.execute(query)).all(), [column.key for column in FORECAST_COLUMNS])
+    result = await db.scalars(query)
+    return result.all()
 
 @router.get("/{product_id}", response_model=List[Forecast])
-def get_product_forecast(
+async def get_product_forecast(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_async_db),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    current_user: User = Depends(get_current_user),
+    response_format: ResponseFormat = Query("rows", alias="format"),
+    current_user: User = Depends(get_current_user_async),
 ) -> List[Forecast]:
     """
-    Get forecasts for a specific product
+    Get the latest forecasts for a specific product.
+    format=columnar returns one array per field instead of a list of objects.
     """
-    query = db.query(ForecastModel).filter(ForecastModel.product_id == product_id)
+    columnar = response_format == "columnar"
+    query = latest_forecasts(*FORECAST_COLUMNS) if columnar else latest_forecasts()
+    query = query.where(LatestForecast.product_id == product_id)
     
     if start_date:
-        query = query.filter(ForecastModel.date >= start_date)
+        query = query.where(ForecastModel.date >= start_date)
     if end_date:
-        query = query.filter(ForecastModel.date <= end_date)
+        query = query.where(ForecastModel.date <= end_date)
     
-    forecasts = query.order_by(ForecastModel.date).all()
+    query = query.order_by(ForecastModel.date)
+    if columnar:
+        return columnar_response((await db.execute(query)).all(), [column.key for column in FORECAST_COLUMNS])
+    forecasts = (await db.scalars(query)).all()
     
     # Don't raise 404 if no forecasts exist, just return empty list
     # if not forecasts:
@@ -94,20 +198,17 @@ def generate_forecasts(
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
-    Trigger background task to generate new forecasts for products
+    Trigger background task to generate new forecasts for products.
+    Progress is pushed on /events/stream as forecast_progress events with the returned job_id.
     """
     try:
         # Add the forecast generation task to the background
-        background_tasks.add_task(
-            run_forecast_generation,
-            db,
-            forecast_params.product_ids,
-            forecast_params.periods,
-            forecast_params.frequency
-        )
+        job_id = uuid.uuid4().hex
+        background_tasks.add_task(run_forecast_generation, db, forecast_params, job_id)
         
         return {
             "status": "accepted",
+            "job_id": job_id,
             "message": "Forecast generation started in the background."
         }
     
@@ -118,6 +219,34 @@ def generate_forecasts(
             detail=f"Failed to start forecast generation: {str(e)}"
         )
 
+@router.post("/backtest", status_code=status.HTTP_202_ACCEPTED)
+def start_backtest(
+    backtest_params: BacktestRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Trigger a background rolling-origin backtest; results are stored per
+    product and engine and served by /forecasts/backtest/scorecard
+    """
+    background_tasks.add_task(run_backtest, db, backtest_params)
+    return {
+        "status": "accepted",
+        "message": "Backtest started in the background."
+    }
+
+@router.get("/backtest/scorecard", response_model=BacktestScorecard)
+def get_backtest_scorecard(
+    engine: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> BacktestScorecard:
+    """
+    Get the latest backtest accuracy (MAPE/WAPE/bias) per product and engine
+    """
+    return BacktestService(db).scorecard(engine)
+
 @router.get("/prophet/forecast", response_model=List[Dict[str, Any]])
 def get_prophet_forecast() -> List[Dict[str, Any]]:
     """
@@ -131,6 +260,8 @@ def get_prophet_forecast() -> List[Dict[str, Any]]:
         if not os.path.exists(forecast_path):
             # If not, generate it
             input_csv = "/home/ubuntu/Resupply-forecast-app/data/cleaned_data.csv"
+            import pandas as pd
+            Prophet = get_engine("prophet")
             
             # Read the CSV
             df = pd.read_csv(input_csv)
@@ -156,15 +287,13 @@ def get_prophet_forecast() -> List[Dict[str, Any]]:
             forecast_output = forecast[["ds", "yhat"]].copy()
             forecast_output["ds"] = forecast_output["ds"].dt.strftime("%Y-%m-%d")
             
-            # Save to JSON
+            # Save to JSON (compact: the file is served as-is)
             with open(forecast_path, "w") as f:
-                json.dump(forecast_output.to_dict(orient="records"), f, indent=4)
-        
-        # Read the forecast from the JSON file
-        with open(forecast_path, "r") as f:
-            forecast_data = json.load(f)
+                json.dump(forecast_output.to_dict(orient="records"), f, separators=(",", ":"))
         
-        return forecast_data
+        # Serve the file's bytes directly instead of parsing and re-encoding them
+        with open(forecast_path, "rb") as f:
+            return Response(content=f.read(), media_type="application/json")
     
     except Exception as e:
         print(f"Error getting Prophet forecast: {e}")
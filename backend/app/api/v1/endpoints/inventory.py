@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.config import settings
+from app.api.v1.deps import get_db, get_read_async_db, get_current_user, get_current_user_async
+from app.schemas.inventory import (
+    InventoryOptimize,
+    InventoryOptimizeResult,
+    InventoryPolicy,
+    InventorySync,
+    InventorySyncResult,
+    StockoutSimulate,
+    StockoutSimulationResult,
+)
+from app.db.models.inventory import InventoryPolicy as InventoryPolicyModel
+from app.db.models.user import User
+from app.services.inventory import InventoryOptimizer, StockoutSimulator, sync_stock_levels
+
+router = APIRouter()
+
+@router.post("/optimize", response_model=InventoryOptimizeResult)
+def optimize_inventory(
+    params: InventoryOptimize,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventoryOptimizeResult:
+    """
+    Recompute safety stock, reorder point and suggested order quantity for
+    all (or the given) products from the latest forecasts
+    """
+    return InventoryOptimizer(db).optimize(params.product_ids)
+
+@router.post("/sync", response_model=InventorySyncResult)
+def sync_inventory(
+    params: InventorySync,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventorySyncResult:
+    """
+    Update stock levels from an inventory system. Alerts of the synced
+    products are re-evaluated in the background.
+    """
+    return sync_stock_levels(db, {item.product_id: item.stock_level for item in params.items})
+
+@router.post("/simulate", response_model=StockoutSimulationResult)
+def simulate_stockouts(
+    params: StockoutSimulate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StockoutSimulationResult:
+    """
+    Stockout probability per horizon and expected stockout date for all (or
+    the given) products, simulated from the latest forecast distributions.
+    Products whose latest forecast is not daily are listed as skipped.
+    """
+    if params.horizons is not None and (not params.horizons or min(params.horizons) < 1):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Horizons must be at least one day")
+    if params.horizons is not None and max(params.horizons) > settings.STOCKOUT_SIMULATION_MAX_HORIZON_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Horizons must be at most {settings.STOCKOUT_SIMULATION_MAX_HORIZON_DAYS} days",
+        )
+    if params.paths is not None and not 1 <= params.paths <= settings.STOCKOUT_SIMULATION_MAX_PATHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"paths must be between 1 and {settings.STOCKOUT_SIMULATION_MAX_PATHS}",
+        )
+    if params.demand_scale < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="demand_scale must not be negative")
+    return StockoutSimulator(db).simulate(
+        params.product_ids,
+        horizons=params.horizons,
+        paths=params.paths,
+        demand_scale=params.demand_scale,
+        stock_levels=params.stock_levels,
+        seed=params.seed,
+    )
+
+@router.get("/policies", response_model=List[InventoryPolicy])
+async def get_inventory_policies(
+    db: AsyncSession = Depends(get_read_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    product_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user_async),
+) -> List[InventoryPolicy]:
+    """
+    Get computed inventory policies
+    """
+    query = select(InventoryPolicyModel)
+    
+    if product_id:
+        query = query.where(InventoryPolicyModel.product_id == product_id)
+    
+    result = await db.scalars(query.order_by(InventoryPolicyModel.product_id).offset(skip).limit(limit))
+    return result.all()
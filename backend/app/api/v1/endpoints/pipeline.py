@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from sqlalchemy.orm import Session
+from typing import Any, Dict
+
+from app.api.v1.deps import get_db, get_current_user
+from app.core.config import settings
+from app.schemas.pipeline import PipelineStatus
+from app.db.models.user import User
+from app.services.pipeline import ingest_watermark, pipeline_runner
+
+router = APIRouter()
+
+@router.post("/run", status_code=status.HTTP_202_ACCEPTED)
+def run_pipeline(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Trigger one ingest -> clean -> forecast -> alert run in the background
+    """
+    if pipeline_runner.running:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A pipeline run is already in progress"
+        )
+    background_tasks.add_task(pipeline_runner.run)
+    return {"message": "Pipeline run started in the background"}
+
+@router.get("/status", response_model=PipelineStatus)
+def get_pipeline_status(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> PipelineStatus:
+    """
+    Get the pipeline stages, ingest watermark and recent run reports
+    """
+    return {
+        "running": pipeline_runner.running,
+        "scheduled": settings.PIPELINE_INTERVAL_MINUTES > 0,
+        "interval_minutes": settings.PIPELINE_INTERVAL_MINUTES,
+        "stages": pipeline_runner.pipeline.order,
+        "last_ingested_date": ingest_watermark(db),
+        "runs": list(reversed(pipeline_runner.history)),
+    }
@@ -1,42 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.api.v1.deps import get_db, get_current_user
-from app.schemas.product import Product, ProductCreate, ProductUpdate
-from app.db.models.product import Product as ProductModel
+from app.core.events import STOCK_CHANGED, event_bus
+from app.api.v1.deps import get_db, get_read_async_db, get_current_user, get_current_user_async
+from app.schemas.product import (
+    CategorySettings,
+    CategorySettingsUpdate,
+    Product,
+    ProductBulkResult,
+    ProductCreate,
+    ProductUpdate,
+)
+from app.db.models.product import CategorySettings as CategorySettingsModel, Product as ProductModel
 from app.db.models.user import User
+from app.services.product_bulk import ProductBulkService, parse_ndjson
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Product])
-def get_products(
-    db: Session = Depends(get_db),
+async def get_products(
+    db: AsyncSession = Depends(get_read_async_db),
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
 ) -> List[Product]:
     """
     Get all products with optional filtering
     """
-    query = db.query(ProductModel)
+    query = select(ProductModel)
     
     if category:
-        query = query.filter(ProductModel.category == category)
+        query = query.where(ProductModel.category == category)
     
-    return query.offset(skip).limit(limit).all()
+    result = await db.scalars(query.order_by(ProductModel.id).offset(skip).limit(limit))
+    return result.all()
 
-@router.get("/{product_id}", response_model=Product)
-def get_product(
-    product_id: int,
+@router.get("/categories/settings", response_model=List[CategorySettings])
+async def get_category_settings(
+    db: AsyncSession = Depends(get_read_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> List[CategorySettings]:
+    """
+    Get the alert horizon and lead time configured per category
+    """
+    result = await db.scalars(select(CategorySettingsModel).order_by(CategorySettingsModel.category))
+    return result.all()
+
+@router.put("/categories/{category}/settings", response_model=CategorySettings)
+def update_category_settings(
+    category: str,
+    settings_in: CategorySettingsUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+) -> CategorySettings:
+    """
+    Set the alert horizon and lead time used by the category's products
+    that do not set their own
+    """
+    category_settings = db.get(CategorySettingsModel, category) or CategorySettingsModel(category=category)
+    for field, value in settings_in.dict(exclude_unset=True).items():
+        setattr(category_settings, field, value)
+    db.add(category_settings)
+    db.commit()
+    db.refresh(category_settings)
+    return category_settings
+
+@router.get("/{product_id}", response_model=Product)
+async def get_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_read_async_db),
+    current_user: User = Depends(get_current_user_async),
 ) -> Product:
     """
     Get a specific product by ID
     """
-    product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
+    product = await db.get(ProductModel, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,6 +103,37 @@ def create_product(
     db.refresh(db_product)
     return db_product
 
+@router.post("/bulk", response_model=ProductBulkResult)
+async def bulk_products(
+    request: Request,
+    mode: str = Query("upsert", pattern="^(create|update|upsert)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ProductBulkResult:
+    """
+    Create, update or upsert many products at once.
+    Accepts a JSON array, or NDJSON with Content-Type application/x-ndjson.
+    Upsert updates rows whose id exists and creates the others, under their
+    id when the row gives one.
+    Rows are written in chunked transactions; invalid rows are reported
+    individually without aborting the rest of the batch.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        rows = parse_ndjson(body)
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON body: {e}")
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array of products",
+            )
+
+    return await run_in_threadpool(ProductBulkService(db).apply, rows, mode)
+
 @router.put("/{product_id}", response_model=Product)
 def update_product(
     product_id: int,
@@ -83,6 +158,8 @@ def update_product(
     db.add(product) # Add to session before commit
     db.commit()
     db.refresh(product)
+    # Alerts for this product are re-checked in the background
+    event_bus.publish(STOCK_CHANGED, product_ids=[product.id])
     return product
 
 @router.delete("/{product_id}", response_model=Product)
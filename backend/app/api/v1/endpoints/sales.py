@@ -1,152 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 
-from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.deps import get_db, get_read_async_db, get_current_user, get_current_user_async
+from app.core.responses import ResponseFormat, columnar_response
 from app.schemas.sales import RawSales, CleanSales, SalesImport
 from app.db.models.sales import RawSales as RawSalesModel, CleanSales as CleanSalesModel
 from app.db.models.user import User
-from app.db.models.product import Product # Import Product model
 from app.services.dynamics_bc import DynamicsBCService
+from app.services.sales_ingest import process_and_save_sales
 
 router = APIRouter()
 
-def process_and_save_sales(db: Session, sales_data: List[dict]):
-    """Helper function to process and save sales data in the background."""
-    raw_count = 0
-    clean_count = 0
-    processed_ids = set()
-
-    # Get existing product IDs from the database for validation
-    existing_product_ids = {p.id for p in db.query(Product.id).all()}
-
-    for sale in sales_data:
-        # Map Dynamics BC fields to our model
-        # Adjust field mappings based on actual Dynamics BC API response
-        # Assuming 'itemId' from BC corresponds to our 'product_id'
-        # Assuming 'postingDate' is the sale date
-        # Assuming 'quantity' represents sales quantity (needs to be positive)
-        # Assuming 'entryType' indicates if it's a sale
-        
-        try:
-            # Use .get() with defaults to handle potentially missing keys
-            bc_item_id_str = sale.get("itemId") # BC Item ID might be a GUID string
-            # Find corresponding internal product ID. Requires a mapping or matching logic.
-            # For this example, we'll try to find a product with a matching name or number if ID fails.
-            # This mapping logic needs refinement based on how BC items relate to your Product model.
-            product_id = None
-            if bc_item_id_str:
-                 # Simplistic: Assume internal ID matches BC ID for now. Needs proper mapping.
-                 # product = db.query(Product).filter(Product.dynamics_bc_id == bc_item_id_str).first()
-                 # if product: product_id = product.id
-                 # TEMPORARY: If ID is numeric string, try converting
-                 try:
-                     potential_id = int(bc_item_id_str)
-                     if potential_id in existing_product_ids:
-                         product_id = potential_id
-                 except ValueError:
-                     pass # BC ID might not be an integer
-
-            if not product_id:
-                # print(f"Skipping sale: Could not map BC item ID ")
-                continue # Skip if product mapping fails
-
-            sale_date_str = sale.get("postingDate", ")
-            if not sale_date_str:
-                continue
-            sale_date = date.fromisoformat(sale_date_str.split("T")[0])
-            
-            quantity = abs(int(sale.get("quantity", 0)))
-            entry_type = sale.get("entryType")
-
-            # Skip non-sales entries or zero quantity
-            if quantity <= 0 or entry_type != "Sale":
-                continue
-
-            # Avoid duplicates within this batch (simple check)
-            sale_key = (product_id, sale_date, quantity)
-            if sale_key in processed_ids:
-                continue
-            processed_ids.add(sale_key)
-
-            # Save as raw sales
-            raw_sale = RawSalesModel(
-                product_id=product_id,
-                date=sale_date,
-                quantity=quantity
-            )
-            db.add(raw_sale)
-            raw_count += 1
-            
-            # Also save as clean sales (in a real app, apply cleaning logic here)
-            clean_sale = CleanSalesModel(
-                product_id=product_id,
-                date=sale_date,
-                quantity=quantity
-            )
-            db.add(clean_sale)
-            clean_count += 1
-
-        except Exception as e:
-            print(f"Error processing sale record {sale.get("id", "N/A")}: {e}")
-            # Optionally log the error and continue with the next record
-            continue
-
-    try:
-        db.commit()
-        print(f"Successfully committed {raw_count} raw and {clean_count} clean sales records.")
-    except Exception as e:
-        db.rollback()
-        print(f"Database commit failed: {e}")
+# Fields of the sales schemas, selected as plain columns for the columnar format
+SALES_FIELDS = ("id", "product_id", "date", "quantity")
 
 @router.get("/raw", response_model=List[RawSales])
-def get_raw_sales(
-    db: Session = Depends(get_db),
+async def get_raw_sales(
+    db: AsyncSession = Depends(get_read_async_db),
     skip: int = 0,
     limit: int = 100,
     product_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    current_user: User = Depends(get_current_user),
+    response_format: ResponseFormat = Query("rows", alias="format"),
+    current_user: User = Depends(get_current_user_async),
 ) -> List[RawSales]:
     """
-    Get raw sales data with optional filtering
+    Get raw sales data with optional filtering.
+    format=columnar returns one array per field instead of a list of objects.
     """
-    query = db.query(RawSalesModel)
+    columnar = response_format == "columnar"
+    query = select(*(getattr(RawSalesModel, field) for field in SALES_FIELDS)) if columnar else select(RawSalesModel)
     
     if product_id:
-        query = query.filter(RawSalesModel.product_id == product_id)
+        query = query.where(RawSalesModel.product_id == product_id)
     if start_date:
-        query = query.filter(RawSalesModel.date >= start_date)
+        query = query.where(RawSalesModel.date >= start_date)
     if end_date:
-        query = query.filter(RawSalesModel.date <= end_date)
+        query = query.where(RawSalesModel.date <= end_date)
     
-    return query.order_by(RawSalesModel.date.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(RawSalesModel.date.desc()).offset(skip).limit(limit)
+    if columnar:
+        return columnar_response((await db.execute(query)).all(), SALES_FIELDS)
+    result = await db.scalars(query)
+    return result.all()
 
 @router.get("/clean", response_model=List[CleanSales])
-def get_clean_sales(
-    db: Session = Depends(get_db),
+async def get_clean_sales(
+    db: AsyncSession = Depends(get_read_async_db),
     skip: int = 0,
     limit: int = 100,
     product_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    current_user: User = Depends(get_current_user),
+    response_format: ResponseFormat = Query("rows", alias="format"),
+    current_user: User = Depends(get_current_user_async),
 ) -> List[CleanSales]:
     """
-    Get cleaned sales data with optional filtering
+    Get cleaned sales data with optional filtering.
+    format=columnar returns one array per field instead of a list of objects.
     """
-    query = db.query(CleanSalesModel)
+    columnar = response_format == "columnar"
+    query = select(*(getattr(CleanSalesModel, field) for field in SALES_FIELDS)) if columnar else select(CleanSalesModel)
     
     if product_id:
-        query = query.filter(CleanSalesModel.product_id == product_id)
+        query = query.where(CleanSalesModel.product_id == product_id)
     if start_date:
-        query = query.filter(CleanSalesModel.date >= start_date)
+        query = query.where(CleanSalesModel.date >= start_date)
     if end_date:
-        query = query.filter(CleanSalesModel.date <= end_date)
+        query = query.where(CleanSalesModel.date <= end_date)
     
-    return query.order_by(CleanSalesModel.date.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(CleanSalesModel.date.desc()).offset(skip).limit(limit)
+    if columnar:
+        return columnar_response((await db.execute(query)).all(), SALES_FIELDS)
+    result = await db.scalars(query)
+    return result.all()
 
 @router.post("/import", status_code=status.HTTP_202_ACCEPTED)
 def import_sales_data(
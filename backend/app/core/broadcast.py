@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Optional, Set, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.events import ALERTS_CHANGED, FORECAST_PROGRESS, PIPELINE_PROGRESS, event_bus
+from app.core.metrics import SSE_CLIENTS, SSE_DROPPED_CLIENTS
+
+# Bus events pushed to connected dashboards
+STREAMED_EVENTS = (ALERTS_CHANGED, FORECAST_PROGRESS, PIPELINE_PROGRESS)
+
+class _Client:
+    """One connected stream: a bounded queue on the event loop serving it"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SSE_CLIENT_QUEUE_SIZE)
+        self.dropped = False
+
+    def put(self, frame: bytes) -> None:
+        # Runs on the client's loop
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # A client that falls this far behind reconnects and replays instead
+            self.dropped = True
+            SSE_DROPPED_CLIENTS.inc()
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+class EventBroadcaster:
+    """
+    Fans bus events out to every connected server-sent event stream.
+    Each event is encoded once and the same frame is queued for all clients,
+    so N dashboards cost one subscription instead of N polling loops.
+    Recent frames are kept for clients reconnecting with Last-Event-ID.
+    """
+
+    def __init__(self, event_types: Iterable[str] = STREAMED_EVENTS):
+        self.event_types = tuple(event_types)
+        self._clients: Set[_Client] = set()
+        self._recent: Deque[Tuple[int, bytes]] = deque(maxlen=settings.SSE_REPLAY_EVENTS)
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._subscribed = False
+
+    def _subscribe(self) -> None:
+        with self._lock:
+            if self._subscribed:
+                return
+            self._subscribed = True
+        for event_type in self.event_types:
+            event_bus.subscribe(event_type, self._on_event)
+
+    def _on_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        """Called in the publisher's thread: encode once, then hand off to each client's loop"""
+        data = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            frame = b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), data)
+            self._recent.append((event_id, frame))
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.loop.call_soon_threadsafe(client.put, frame)
+            except RuntimeError:
+                # The client's loop has closed
+                self._discard(client)
+
+    def _discard(self, client: _Client) -> None:
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+                SSE_CLIENTS.dec()
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Server-sent event frames for one client, until it disconnects or falls behind"""
+        self._subscribe()
+        client = _Client(asyncio.get_running_loop())
+        with self._lock:
+            self._clients.add(client)
+            SSE_CLIENTS.inc()
+            missed = []
+            if last_event_id is not None and last_event_id.isdigit():
+                missed = [frame for event_id, frame in self._recent if event_id > int(last_event_id)]
+        try:
+            # Reconnect quickly after a drop or server restart
+            yield b"retry: 3000\n\n"
+            for frame in missed:
+                yield frame
+            while True:
+                try:
+                    frame = await asyncio.wait_for(client.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield b": keep-alive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._discard(client)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+broadcaster = EventBroadcaster()
@@ -0,0 +1,47 @@
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+# Product change events. Payloads carry the affected "product_ids".
+STOCK_CHANGED = "stock_changed"  # Product stock level or reorder settings were written
+FORECAST_SAVED = "forecast_saved"  # A new latest forecast run was saved
+# Stock alerts were created or resolved: "created"/"resolved" alert IDs, and "alerts" with the new rows
+ALERTS_CHANGED = "alerts_changed"
+
+# Job progress events
+FORECAST_PROGRESS = "forecast_progress"  # Background forecast job: "job_id", "status", "done", "total"
+PIPELINE_PROGRESS = "pipeline_progress"  # Ingest pipeline: "stage" (None for the whole run), "status", "products"
+
+Handler = Callable[[str, Dict[str, Any]], None]
+
+class EventBus:
+    """
+    In-process publish/subscribe. Handlers run synchronously in the
+    publisher's thread, so they should only hand work off (e.g. to a queue).
+    Publish after the change is committed so handlers see it.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        with self._lock:
+            self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: str, handler: Handler) -> None:
+        with self._lock:
+            if handler in self._handlers[event_type]:
+                self._handlers[event_type].remove(handler)
+
+    def publish(self, event_type: str, **payload: Any) -> None:
+        with self._lock:
+            handlers = list(self._handlers[event_type])
+        for handler in handlers:
+            try:
+                handler(event_type, payload)
+            except Exception as e:
+                # A failing subscriber must not break the write that published the event
+                print(f"Error handling {event_type} event in {getattr(handler, '__name__', handler)}: {e}")
+
+event_bus = EventBus()
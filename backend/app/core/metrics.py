@@ -0,0 +1,88 @@
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+# Buckets for work that ranges from milliseconds (queries, small writes)
+# to minutes (model fits on long histories, full BC ledger pulls)
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+BC_FETCH_SECONDS = Histogram(
+    "resupply_bc_fetch_seconds", "Dynamics BC API request time", ["resource"], buckets=SLOW_BUCKETS
+)
+BC_FETCH_ERRORS = Counter("resupply_bc_fetch_errors_total", "Failed Dynamics BC API requests", ["resource"])
+BC_FETCH_RECORDS = Counter("resupply_bc_fetch_records_total", "Records returned by Dynamics BC", ["resource"])
+
+INGEST_SECONDS = Histogram("resupply_ingest_seconds", "Time to map, validate and save a sales batch", buckets=SLOW_BUCKETS)
+# rate() of these gives ingestion rows/s
+INGEST_ROWS = Counter("resupply_ingest_rows_total", "Sales records processed by ingestion", ["outcome"])
+
+FORECAST_FIT_SECONDS = Histogram(
+    "resupply_forecast_fit_seconds", "Model fit time per series", ["engine"], buckets=SLOW_BUCKETS
+)
+FORECAST_PREDICT_SECONDS = Histogram(
+    "resupply_forecast_predict_seconds", "Model predict time per series", ["engine"], buckets=SLOW_BUCKETS
+)
+FORECAST_FAILURES = Counter("resupply_forecast_failures_total", "Series whose fit or predict failed", ["engine"])
+FORECAST_SAVE_SECONDS = Histogram("resupply_forecast_save_seconds", "save_forecast write time", buckets=SLOW_BUCKETS)
+
+ALERT_EVALUATION_SECONDS = Histogram(
+    "resupply_alert_evaluation_seconds", "Time to evaluate stock alerts", buckets=SLOW_BUCKETS
+)
+ALERTS_CREATED = Counter("resupply_alerts_created_total", "Stock alerts created")
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "resupply_pipeline_stage_seconds", "Pipeline stage run time", ["stage"], buckets=SLOW_BUCKETS
+)
+PIPELINE_STAGE_PRODUCTS = Counter(
+    "resupply_pipeline_stage_products_total", "Products affected by each pipeline stage", ["stage"]
+)
+PIPELINE_RUNS = Counter("resupply_pipeline_runs_total", "Pipeline runs", ["status"])
+
+DB_READ_ROUTES = Counter("resupply_db_read_routes_total", "Read-only requests by database served", ["route"])
+DB_REPLICA_FAILURES = Counter(
+    "resupply_db_replica_failures_total", "Read replica connection failures that sent reads to the primary", ["error"]
+)
+
+SSE_CLIENTS = Gauge("resupply_sse_clients", "Connected event stream clients")
+SSE_DROPPED_CLIENTS = Counter("resupply_sse_dropped_clients_total", "Event stream clients dropped for falling behind")
+
+class DBPoolCollector:
+    """Reports connection pool usage of the sync and async (and replica) engines at scrape time"""
+
+    def _families(self):
+        return {
+            name: GaugeMetricFamily(f"resupply_db_pool_{name}", help_text, labels=["engine"])
+            for name, help_text in (
+                ("size", "Configured pool size"),
+                ("checked_out", "Connections currently in use"),
+                ("checked_in", "Idle connections in the pool"),
+                ("overflow", "Connections open beyond the pool size"),
+            )
+        }
+
+    def describe(self):
+        # Registration only needs the names; collecting would import app.db.session, which imports this module
+        yield from self._families().values()
+
+    def collect(self):
+        from app.db.session import async_engine, async_replica_engine, engine, replica_engine
+
+        gauges = self._families()
+        pools = [("sync", engine.pool), ("async", async_engine.pool)]
+        if replica_engine is not None:
+            pools.append(("replica_sync", replica_engine.pool))
+        if async_replica_engine is not None:
+            pools.append(("replica_async", async_replica_engine.pool))
+        for label, pool in pools:
+            # sqlite pools do not implement every counter
+            for name, method in (("size", "size"), ("checked_out", "checkedout"),
+                                 ("checked_in", "checkedin"), ("overflow", "overflow")):
+                if hasattr(pool, method):
+                    # QueuePool reports overflow as negative until the pool is full
+                    gauges[name].add_metric([label], max(0, getattr(pool, method)()))
+        yield from gauges.values()
+
+REGISTRY.register(DBPoolCollector())
+
+def render_metrics():
+    """Current metrics in the Prometheus text exposition format"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,21 @@
+from typing import Any, Collection
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class ExcludePathsMiddleware:
+    """
+    Run `middleware` around every request except those to
+    `exclude_paths`, which go straight to the inner app. Used to keep
+    long-lived streams out of middleware that buffers or wraps the body.
+    """
+
+    def __init__(self, app: ASGIApp, middleware: type, exclude_paths: Collection[str], **options: Any):
+        self.app = app
+        self.wrapped = middleware(app, **options)
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.wrapped(scope, receive, send)
@@ -1,18 +1,27 @@
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+# Scope of the short-lived tokens accepted on the event stream's query string
+EVENT_STREAM_SCOPE = "event_stream"
+
+def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None, scope: Optional[str] = None) -> str:
+    """
+    Bearer token for `subject`. A scoped token is only accepted where that
+    scope is required, and never as a regular access token.
+    """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {"exp": expire, "sub": str(subject)}
+    if scope:
+        to_encode["scope"] = scope
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
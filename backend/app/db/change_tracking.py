@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import and_, event, exists, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.product import Product
+from app.db.models.sales import CleanSales
+
+def mark_sales_changed(db: Session, product_ids: Iterable[int], changed_at: Optional[datetime] = None) -> None:
+    """
+    Record that the clean sales of these products changed. ORM writes are
+    tracked automatically; bulk Core inserts/updates/deletes on clean_sales
+    must call this themselves.
+    """
+    product_ids = {product_id for product_id in product_ids if product_id is not None}
+    if not product_ids:
+        return
+    # Core statement on the session's connection: no autoflush, safe inside flush events
+    db.connection().execute(
+        update(Product.__table__)
+        .where(Product.__table__.c.id.in_(product_ids))
+        .values(sales_changed_at=changed_at or datetime.now())
+    )
+
+def changed_products_filter():
+    """
+    Products whose clean sales changed after their last successful forecast,
+    plus products with sales that were never forecast
+    """
+    return or_(
+        Product.sales_changed_at > Product.forecasted_at,
+        and_(
+            Product.forecasted_at.is_(None),
+            exists().where(CleanSales.product_id == Product.id),
+        ),
+    )
+
+def changed_product_ids(db: Session, product_ids: Optional[Iterable[int]] = None) -> Set[int]:
+    query = select(Product.id).where(changed_products_filter())
+    if product_ids is not None:
+        query = query.where(Product.id.in_(list(product_ids)))
+    return set(db.scalars(query))
+
+@event.listens_for(Session, "after_flush")
+def _track_clean_sales_changes(session: Session, flush_context) -> None:
+    """Mark products whose clean sales were inserted, updated or deleted in this flush"""
+    product_ids = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, CleanSales):
+            product_ids.add(obj.product_id)
+    for obj in session.dirty:
+        if isinstance(obj, CleanSales) and session.is_modified(obj, include_collections=False):
+            history = inspect(obj).attrs.product_id.history
+            # A sale moved to another product changes both products
+            product_ids.update(history.deleted or ())
+            product_ids.add(obj.product_id)
+    mark_sales_changed(session, product_ids)
@@ -0,0 +1,52 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.forecast import Forecast, ForecastRun, LatestForecast
+
+def backfill_forecast_runs(db: Session) -> Dict[str, int]:
+    """
+    Attach forecast rows written before forecast runs existed to a run.
+    Each product's legacy rows become one ForecastRun with running totals,
+    and it becomes the product's latest run unless a newer one was already
+    saved. Safe to re-run: only rows without a run are touched.
+    """
+    rows = db.execute(
+        select(Forecast.id, Forecast.product_id, Forecast.predicted_qty)
+        .where(Forecast.run_id.is_(None))
+        .order_by(Forecast.product_id, Forecast.date, Forecast.id)
+    ).all()
+    by_product: Dict[int, List] = defaultdict(list)
+    for forecast_id, product_id, predicted_qty in rows:
+        by_product[product_id].append((forecast_id, predicted_qty))
+    if not by_product:
+        return {"products": 0, "rows": 0}
+
+    has_latest = set(db.scalars(select(LatestForecast.product_id).where(LatestForecast.product_id.in_(list(by_product)))))
+    for product_id, product_rows in by_product.items():
+        run = ForecastRun(product_id=product_id)
+        db.add(run)
+        db.flush()
+
+        updates, cumulative_qty = [], 0.0
+        for forecast_id, predicted_qty in product_rows:
+            cumulative_qty += predicted_qty or 0.0
+            updates.append({"id": forecast_id, "run_id": run.id, "cumulative_qty": cumulative_qty})
+        db.execute(update(Forecast), updates)
+        if product_id not in has_latest:
+            db.execute(insert(LatestForecast), [{"product_id": product_id, "run_id": run.id}])
+
+    db.commit()
+    return {"products": len(by_product), "rows": len(rows)}
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = backfill_forecast_runs(db)
+        print(f"Backfilled {result['rows']} forecast rows into runs for {result['products']} products")
+    finally:
+        db.close()
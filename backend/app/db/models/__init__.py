@@ -0,0 +1,6 @@
+# Import every model so relationships declared by name always resolve,
+# whichever model module a caller imports first
+from app.db.models import alert, forecast, inventory, product, sales, user
+
+# Registers the session listener that marks products whose clean sales change
+from app.db import change_tracking
@@ -1,10 +1,27 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
+# Alerts in these statuses are open: a product has at most one open alert per type
+OPEN_ALERT_STATUSES = ("new", "acknowledged")
+ALERT_STATUSES = OPEN_ALERT_STATUSES + ("resolved",)
+
+_open_alert_predicate = text("status IN ('new', 'acknowledged')")
+
 class StockAlert(Base):
     __tablename__ = "stock_alerts"
+    __table_args__ = (
+        # Concurrent evaluations (event re-checks, the pipeline, /alerts/check) cannot open a duplicate
+        Index(
+            "uq_stock_alerts_open",
+            "product_id",
+            "alert_type",
+            unique=True,
+            postgresql_where=_open_alert_predicate,
+            sqlite_where=_open_alert_predicate,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
@@ -14,4 +31,3 @@ class StockAlert(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     product = relationship("Product", back_populates="alerts")
-
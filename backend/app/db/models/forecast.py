@@ -1,14 +1,68 @@
-from sqlalchemy import Column, Integer, Date, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Index, select
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
+class ForecastRun(Base):
+    """One immutable forecast version for a product"""
+    __tablename__ = "forecast_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
+    interval_mode = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    forecasts = relationship("Forecast", back_populates="run")
+
 class Forecast(Base):
+    """Forecast rows are append-only; each belongs to a ForecastRun"""
     __tablename__ = "forecasts"
+    __table_args__ = (
+        Index("ix_forecasts_run_id_date", "run_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("forecast_runs.id"))
     product_id = Column(Integer, ForeignKey("products.id"))
     date = Column(Date, index=True)
     predicted_qty = Column(Float)
+    lower_bound = Column(Float, nullable=True)
+    upper_bound = Column(Float, nullable=True)
+    # Running total of predicted_qty over the run's rows up to and including this date,
+    # so demand between two dates is a difference of two rows
+    cumulative_qty = Column(Float, nullable=True)
     
     product = relationship("Product", back_populates="forecasts")
+    run = relationship("ForecastRun", back_populates="forecasts")
+
+class LatestForecast(Base):
+    """Pointer to the current forecast run of each product"""
+    __tablename__ = "forecast_latest"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    run_id = Column(Integer, ForeignKey("forecast_runs.id"), index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+def latest_forecasts(*entities):
+    """SELECT restricted to the rows of each product's latest forecast run"""
+    return (
+        select(*(entities or (Forecast,)))
+        .select_from(Forecast)
+        .join(LatestForecast, LatestForecast.run_id == Forecast.run_id)
+    )
+
+
+class ForecastMetric(Base):
+    __tablename__ = "forecast_metrics"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
+    engine = Column(String, index=True)
+    horizon = Column(Integer)
+    folds = Column(Integer)
+    mape = Column(Float, nullable=True)  # None when every actual in the test windows is zero
+    wape = Column(Float, nullable=True)
+    bias = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    product = relationship("Product", back_populates="forecast_metrics")
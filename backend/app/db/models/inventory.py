@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+class InventoryPolicy(Base):
+    __tablename__ = "inventory_policies"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    lead_time_days = Column(Integer)
+    service_level = Column(Float)
+    lead_time_demand = Column(Float)
+    safety_stock = Column(Float)
+    reorder_point = Column(Float)
+    order_qty = Column(Float)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    product = relationship("Product", back_populates="inventory_policy")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, DateTime
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -10,9 +10,24 @@ class Product(Base):
     category = Column(String, index=True)
     stock_level = Column(Integer, default=0)
     reorder_threshold = Column(Integer, default=0)
+    lead_time_days = Column(Integer, nullable=True)  # Defaults to the category's, then settings.DEFAULT_LEAD_TIME_DAYS
+    service_level = Column(Float, nullable=True)  # Defaults to settings.DEFAULT_SERVICE_LEVEL
+    alert_horizon_days = Column(Integer, nullable=True)  # Defaults to the category's, then settings.ALERT_HORIZON_DAYS
+    sales_changed_at = Column(DateTime, nullable=True)  # Last insert/update/delete of this product's clean sales
+    forecasted_at = Column(DateTime, nullable=True)  # Sales snapshot time of the latest saved forecast
 
     raw_sales = relationship("RawSales", back_populates="product")
     clean_sales = relationship("CleanSales", back_populates="product")
     forecasts = relationship("Forecast", back_populates="product")
+    forecast_metrics = relationship("ForecastMetric", back_populates="product")
     alerts = relationship("StockAlert", back_populates="product")
+    inventory_policy = relationship("InventoryPolicy", back_populates="product", uselist=False)
 
+
+class CategorySettings(Base):
+    """Planning parameters shared by the products of a category, unless a product sets its own"""
+    __tablename__ = "category_settings"
+
+    category = Column(String, primary_key=True)
+    alert_horizon_days = Column(Integer, nullable=True)
+    lead_time_days = Column(Integer, nullable=True)
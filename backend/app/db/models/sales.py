@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey
+from sqlalchemy import Column, Integer, Date, ForeignKey, String
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,6 +9,8 @@ class RawSales(Base):
     product_id = Column(Integer, ForeignKey("products.id"))
     date = Column(Date, index=True)
     quantity = Column(Integer)
+    # Dynamics BC ledger entry ID, so an entry fetched again is never stored twice
+    ledger_entry_id = Column(String, unique=True, nullable=True)
     
     product = relationship("Product", back_populates="raw_sales")
 
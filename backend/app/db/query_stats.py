@@ -0,0 +1,84 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.session import async_engine, async_replica_engine, engine, replica_engine
+
+class QueryStats:
+    """
+    Queries and DB time of one unit of work. Kept mutable so that threadpool
+    workers, which run in a copy of the request context, add to the same object.
+    """
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+    @property
+    def milliseconds(self) -> float:
+        return round(self.seconds * 1000, 2)
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Trackers that see every query in the process regardless of context (see assert_max_queries)
+_global_trackers: List[QueryStats] = []
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    trackers = list(_global_trackers)
+    stats = _current_stats.get()
+    if stats is not None:
+        trackers.append(stats)
+    for tracker in trackers:
+        tracker.count += 1
+        tracker.seconds += elapsed
+        if tracker.statements is not None:
+            tracker.statements.append(statement)
+
+def _instrument(target: Engine) -> None:
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+_instrument(engine)
+_instrument(async_engine.sync_engine)
+if replica_engine is not None:
+    _instrument(replica_engine)
+if async_replica_engine is not None:
+    _instrument(async_replica_engine.sync_engine)
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the queries issued in the current context (one request, one job)"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError if the block issues more than `max_queries`
+    queries. Counts every query in the process, so it also sees queries run
+    by a TestClient's server thread. For guarding endpoints against N+1s:
+
+        with assert_max_queries(3):
+            client.get("/api/v1/dashboard/", headers=headers)
+    """
+    stats = QueryStats(record_statements=True)
+    _global_trackers.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_trackers.remove(stats)
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {statement}" for statement in stats.statements)
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}")
@@ -1,10 +1,90 @@
+import time
+from typing import Any, AsyncGenerator, Dict, Generator
+
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.metrics import DB_READ_ROUTES, DB_REPLICA_FAILURES
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def _async_url(url: str) -> str:
+    """Derive the async driver URL from a sync database URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
 
-engine = create_engine(settings.DATABASE_URL)
+def _pool_kwargs(url: str) -> Dict[str, Any]:
+    """Pool settings for an engine; SQLite manages its own pooling."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+engine = create_engine(settings.DATABASE_URL, **_pool_kwargs(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_pool_kwargs(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replica; read-only dependencies use the primary when none is configured
+replica_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL, **_pool_kwargs(settings.DATABASE_REPLICA_URL))
+    if settings.DATABASE_REPLICA_URL else None
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+
+ASYNC_DATABASE_REPLICA_URL = settings.ASYNC_DATABASE_REPLICA_URL or (
+    _async_url(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+)
+async_replica_engine = (
+    create_async_engine(ASYNC_DATABASE_REPLICA_URL, **_pool_kwargs(ASYNC_DATABASE_REPLICA_URL))
+    if ASYNC_DATABASE_REPLICA_URL else None
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+) if async_replica_engine else None
+
+# Clients send this header, or carry this cookie, to read from the primary. After each write the
+# response sets the cookie and tells header-based clients (cross-origin XHR) for how many seconds.
+READ_PRIMARY_HEADER = "X-Read-Primary"
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_SECONDS_HEADER = "X-Read-Primary-Seconds"
+
+_replica_down_until = 0.0
+
+def _mark_replica_down(error: BaseException) -> None:
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+    DB_REPLICA_FAILURES.labels(type(error).__name__).inc()
+
+def _use_replica(request: Request) -> bool:
+    """Reads go to the replica unless it is down or the client asked to read its own writes"""
+    if time.monotonic() < _replica_down_until:
+        return False
+    return not (
+        request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true")
+        or READ_PRIMARY_COOKIE in request.cookies
+    )
+
 def get_db():
     db = SessionLocal()
     try:
@@ -12,3 +92,48 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: the replica when one is configured and
+    reachable, otherwise the primary
+    """
+    db = None
+    if ReadSessionLocal is not None and _use_replica(request):
+        db = ReadSessionLocal()
+        try:
+            # Check out a connection now so an unreachable replica falls back before the query
+            db.connection()
+        except (DBAPIError, OSError) as e:
+            db.close()
+            db = None
+            _mark_replica_down(e)
+    request.state.db_route = "primary" if db is None else "replica"
+    DB_READ_ROUTES.labels(request.state.db_route).inc()
+    db = db or SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_read_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_read_db"""
+    db = None
+    if AsyncReadSessionLocal is not None and _use_replica(request):
+        db = AsyncReadSessionLocal()
+        try:
+            await db.connection()
+        except (DBAPIError, OSError) as e:
+            await db.close()
+            db = None
+            _mark_replica_down(e)
+    request.state.db_route = "primary" if db is None else "replica"
+    DB_READ_ROUTES.labels(request.state.db_route).inc()
+    db = db or AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,29 @@
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+def upsert_rows(db: Session, model: Any, rows: List[Dict[str, Any]], index_elements: List[str]) -> None:
+    """
+    Insert rows, updating the non-key columns of rows that already exist.
+    Uses a single INSERT .. ON CONFLICT DO UPDATE on PostgreSQL and SQLite,
+    and falls back to per-row merges on other databases.
+    """
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            db.merge(model(**row))
+        return
+
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: stmt.excluded[column] for column in rows[0] if column not in index_elements},
+    )
+    db.execute(stmt, rows)
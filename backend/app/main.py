@@ -1,9 +1,18 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import render_metrics
+from app.core.middleware import ExcludePathsMiddleware
+from app.core.responses import ORJSONResponse
 from app.db.session import engine # Import engine
 from app.db.base import Base # Import Base
+from app.db.query_stats import track_queries
+from app.db.session import READ_PRIMARY_COOKIE, READ_PRIMARY_SECONDS_HEADER
+from app.services import engines, pipeline
+from app.services.alert_events import alert_reevaluator
 
 # Create database tables if they don't exist (optional, Alembic is preferred for production)
 # Base.metadata.create_all(bind=engine)
@@ -12,7 +21,8 @@ app = FastAPI(
     title="Intelligent Stock Management System API",
     description="Backend API for the Intelligent Stock Management System",
     version="0.1.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" # Ensure OpenAPI doc path is correct
+    openapi_url=f"{settings.API_V1_STR}/openapi.json", # Ensure OpenAPI doc path is correct
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS
@@ -23,6 +33,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_PRIMARY_SECONDS_HEADER],
+)
+
+# Long-lived streams are kept out of gzip and the BaseHTTPMiddleware wrappers below,
+# whatever the installed Starlette does with text/event-stream, so events are sent as they happen
+STREAMING_PATHS = {f"{settings.API_V1_STR}/events/stream"}
+
+# Compress large responses (forecast and sales lists)
+app.add_middleware(
+    ExcludePathsMiddleware,
+    middleware=GZipMiddleware,
+    exclude_paths=STREAMING_PATHS,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+
+async def count_queries(request: Request, call_next):
+    """Count the SQL queries and DB time of each request to surface N+1 patterns"""
+    with track_queries() as stats:
+        response = await call_next(request)
+    if settings.DEBUG:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-ms"] = str(stats.milliseconds)
+    if stats.count > settings.QUERY_BUDGET:
+        print(
+            f"Query budget exceeded: {request.method} {request.url.path} issued {stats.count} queries "
+            f"({stats.milliseconds} ms), budget {settings.QUERY_BUDGET}"
+        )
+    return response
+
+app.add_middleware(
+    ExcludePathsMiddleware, middleware=BaseHTTPMiddleware, exclude_paths=STREAMING_PATHS, dispatch=count_queries
+)
+
+async def read_your_writes(request: Request, call_next):
+    """
+    After a successful write, route the client's reads to the primary for
+    READ_YOUR_WRITES_SECONDS so replication lag never hides its own changes.
+    Browsers on another origin do not send the cookie back, so the window is
+    also returned as a header that the frontend turns into X-Read-Primary.
+    """
+    response = await call_next(request)
+    if settings.DATABASE_REPLICA_URL:
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE, "1", max_age=settings.READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+            )
+            response.headers[READ_PRIMARY_SECONDS_HEADER] = str(settings.READ_YOUR_WRITES_SECONDS)
+        if settings.DEBUG and hasattr(request.state, "db_route"):
+            response.headers["X-DB-Route"] = request.state.db_route
+    return response
+
+app.add_middleware(
+    ExcludePathsMiddleware, middleware=BaseHTTPMiddleware, exclude_paths=STREAMING_PATHS, dispatch=read_your_writes
 )
 
 # Include API router
@@ -32,14 +96,29 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 def root():
     return {"message": "Welcome to the Intelligent Stock Management System API"}
 
-# Optional: Add startup/shutdown events if needed
-# @app.on_event("startup")
-# async def startup_event():
-#     print("Starting up...")
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.on_event("startup")
+def startup_event():
+    # Only dedicated forecast workers pay for loading the forecasting engines up front
+    if settings.FORECAST_WORKER:
+        timings = engines.prewarm(settings.FORECAST_PREWARM_ENGINES)
+        for name, seconds in timings.items():
+            print(f"Pre-warmed forecasting engine '{name}' in {seconds:.2f}s")
+    if settings.PIPELINE_INTERVAL_MINUTES > 0:
+        pipeline.start_scheduler()
+        print(f"Pipeline scheduled every {settings.PIPELINE_INTERVAL_MINUTES} minutes")
+    if settings.ALERT_EVENTS_ENABLED:
+        alert_reevaluator.start()
 
-# @app.on_event("shutdown")
-# async def shutdown_event():
-#     print("Shutting down...")
+@app.on_event("shutdown")
+def shutdown_event():
+    pipeline.stop_scheduler()
+    alert_reevaluator.stop()
 
 # The following is for running directly with uvicorn, not needed if using Docker
 # if __name__ == "__main__":
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class ProductSummary(BaseModel):
+    product_id: int
+    name: str
+    category: Optional[str] = None
+    stock_level: int
+    reorder_threshold: int
+    horizon_days: int
+    forecast_total: float
+    days_of_cover: Optional[float] = None
+    open_alerts: int
+
+class DashboardSummary(BaseModel):
+    horizon_days: Optional[int] = None  # None when each product uses its configured horizon
+    generated_at: datetime
+    products: List[ProductSummary]
@@ -1,11 +1,13 @@
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import date
+from typing import Optional, List, Literal
+from datetime import date, datetime
 
 class ForecastBase(BaseModel):
     product_id: int
     date: date
     predicted_qty: float
+    lower_bound: Optional[float] = None
+    upper_bound: Optional[float] = None
 
 class ForecastCreate(ForecastBase):
     pass
@@ -23,4 +25,41 @@ class ForecastGenerate(BaseModel):
     product_ids: Optional[List[int]] = None
     periods: int = 30
     frequency: str = "D"  # D=daily, W=weekly, M=monthly
+    interval_mode: Optional[Literal["none", "analytical", "sampling"]] = None  # Defaults to settings
+    uncertainty_samples: Optional[int] = None  # Only used by "sampling"
+    mode: Literal["sku", "hierarchical"] = "sku"  # hierarchical: one model per category
+    categories: Optional[List[str]] = None  # Only used by "hierarchical"
+    reconcile_top_n: int = 0  # Top sellers per category that also get their own fit
+    changed_only: bool = False  # Only refit products whose sales changed since their last forecast ("sku" mode)
+    stream: bool = False  # Write chunk by chunk without keeping results in memory ("sku" mode)
 
+
+class BacktestRequest(BaseModel):
+    product_ids: Optional[List[int]] = None
+    engines: List[str] = ["prophet"]
+    horizon: Optional[int] = None  # Defaults to settings
+    max_folds: Optional[int] = None
+
+class ForecastMetric(BaseModel):
+    product_id: int
+    engine: str
+    horizon: int
+    folds: int
+    mape: Optional[float] = None
+    wape: Optional[float] = None
+    bias: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class EngineScore(BaseModel):
+    engine: str
+    products: int
+    mape: Optional[float] = None
+    wape: Optional[float] = None
+    bias: Optional[float] = None
+
+class BacktestScorecard(BaseModel):
+    engines: List[EngineScore]
+    products: List[ForecastMetric]
@@ -0,0 +1,56 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import date, datetime
+
+class InventoryOptimize(BaseModel):
+    product_ids: Optional[List[int]] = None
+
+class InventoryOptimizeResult(BaseModel):
+    products: int
+    computed_at: datetime
+
+class StockLevel(BaseModel):
+    product_id: int
+    stock_level: int
+
+class InventorySync(BaseModel):
+    items: List[StockLevel]
+
+class InventorySyncResult(BaseModel):
+    updated: int
+    missing: List[int]  # Product IDs that do not exist
+    synced_at: datetime
+
+class InventoryPolicy(BaseModel):
+    product_id: int
+    lead_time_days: int
+    service_level: float
+    lead_time_demand: float
+    safety_stock: float
+    reorder_point: float
+    order_qty: float
+    computed_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class StockoutSimulate(BaseModel):
+    product_ids: Optional[List[int]] = None
+    horizons: Optional[List[int]] = None  # Days; defaults to settings
+    paths: Optional[int] = None  # Defaults to settings
+    demand_scale: float = 1.0  # What-if multiplier on forecast demand
+    stock_levels: Optional[Dict[int, float]] = None  # What-if stock per product ID
+    seed: Optional[int] = None
+
+class StockoutRisk(BaseModel):
+    product_id: int
+    stock_level: float
+    stockout_probability: List[float]  # One per horizon
+    expected_stockout_date: Optional[date] = None  # Mean over paths that stock out within the longest horizon
+
+class StockoutSimulationResult(BaseModel):
+    paths: int
+    horizons: List[int]
+    simulated_at: datetime
+    products: List[StockoutRisk]
+    skipped_product_ids: List[int] = []  # Latest forecast is not daily, so days between rows are unknown
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import date, datetime
+
+class PipelineStageReport(BaseModel):
+    status: str
+    products: int
+    seconds: float
+
+class PipelineRunReport(BaseModel):
+    status: str
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    window: Optional[Dict[str, date]] = None
+    stages: Dict[str, PipelineStageReport] = {}
+    error: Optional[str] = None
+
+class PipelineStatus(BaseModel):
+    running: bool
+    scheduled: bool
+    interval_minutes: int
+    stages: List[str]
+    last_ingested_date: Optional[date] = None
+    runs: List[PipelineRunReport]
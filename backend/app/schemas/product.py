@@ -1,11 +1,14 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 class ProductBase(BaseModel):
     name: str
     category: Optional[str] = None
     stock_level: int = 0
     reorder_threshold: int = 0
+    lead_time_days: Optional[int] = None
+    service_level: Optional[float] = None
+    alert_horizon_days: Optional[int] = None
 
 class ProductCreate(ProductBase):
     pass
@@ -15,6 +18,9 @@ class ProductUpdate(BaseModel):
     category: Optional[str] = None
     stock_level: Optional[int] = None
     reorder_threshold: Optional[int] = None
+    lead_time_days: Optional[int] = None
+    service_level: Optional[float] = None
+    alert_horizon_days: Optional[int] = None
 
 class ProductInDBBase(ProductBase):
     id: int
@@ -25,3 +31,30 @@ class ProductInDBBase(ProductBase):
 class Product(ProductInDBBase):
     pass
 
+
+class CategorySettingsUpdate(BaseModel):
+    alert_horizon_days: Optional[int] = None
+    lead_time_days: Optional[int] = None
+
+class CategorySettings(CategorySettingsUpdate):
+    category: str
+
+    class Config:
+        orm_mode = True
+
+
+class ProductBulkItem(ProductUpdate):
+    id: Optional[int] = None
+
+class ProductBulkError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: str
+
+class ProductBulkResult(BaseModel):
+    mode: str
+    received: int
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ProductBulkError] = []
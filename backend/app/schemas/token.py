@@ -7,4 +7,9 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[int] = None
+    scope: Optional[str] = None
+
+class StreamToken(BaseModel):
+    token: str
+    expires_in: int  # Seconds
 
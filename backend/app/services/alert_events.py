@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.events import FORECAST_SAVED, STOCK_CHANGED, event_bus
+from app.db.session import SessionLocal
+from app.services.forecast import ForecastService
+
+class AlertReevaluator:
+    """
+    Keeps stock alerts current from change events instead of full scans.
+    Stock and forecast events add their product IDs to a pending set; a
+    background thread waits ALERT_EVENT_BATCH_SECONDS after the first one
+    so bursts (bulk updates, forecast batches) are re-checked together,
+    then re-evaluates only those products.
+    """
+
+    def __init__(self, batch_seconds: Optional[float] = None):
+        self.batch_seconds = settings.ALERT_EVENT_BATCH_SECONDS if batch_seconds is None else batch_seconds
+        self._pending: Set[int] = set()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def _on_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        with self._condition:
+            self._pending.update(payload.get("product_ids") or ())
+            self._condition.notify()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        event_bus.subscribe(STOCK_CHANGED, self._on_event)
+        event_bus.subscribe(FORECAST_SAVED, self._on_event)
+        self._thread = threading.Thread(target=self._run, name="alert-reevaluator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        event_bus.unsubscribe(STOCK_CHANGED, self._on_event)
+        event_bus.unsubscribe(FORECAST_SAVED, self._on_event)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if self._stopping:
+                    return
+                # Collect the rest of the burst before checking
+                self._condition.wait_for(lambda: self._stopping, timeout=self.batch_seconds)
+                if self._stopping:
+                    return
+                product_ids, self._pending = self._pending, set()
+            try:
+                self.evaluate(product_ids)
+            except Exception as e:
+                print(f"Error re-evaluating stock alerts for {len(product_ids)} products: {e}")
+
+    def evaluate(self, product_ids: Iterable[int]) -> Dict[str, List[int]]:
+        """Re-check alerts for the given products in a session of their own"""
+        db = SessionLocal()
+        try:
+            result = ForecastService(db).refresh_stock_alerts(sorted(product_ids))
+        finally:
+            db.close()
+        if result["created"] or result["resolved"]:
+            print(f"Alert re-evaluation: {len(result['created'])} created, {len(result['resolved'])} resolved")
+        return result
+
+alert_reevaluator = AlertReevaluator()
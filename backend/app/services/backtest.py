@@ -0,0 +1,221 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.forecast import ForecastMetric
+from app.services.engines import get_engine
+from app.services.sales_snapshot import SalesSnapshot
+
+def _prophet_predict(train_dates: np.ndarray, train_values: np.ndarray, test_dates: np.ndarray) -> np.ndarray:
+    """Same model settings as ForecastService, without uncertainty sampling"""
+    import pandas as pd
+
+    Prophet = get_engine("prophet")
+    model = Prophet(
+        yearly_seasonality=True,
+        weekly_seasonality=True,
+        daily_seasonality=False,
+        seasonality_mode='multiplicative',
+        uncertainty_samples=0,
+    )
+    model.fit(pd.DataFrame({"ds": train_dates, "y": train_values}))
+    return model.predict(pd.DataFrame({"ds": test_dates}))["yhat"].to_numpy()
+
+def _naive_predict(train_dates: np.ndarray, train_values: np.ndarray, test_dates: np.ndarray) -> np.ndarray:
+    """Seasonal-naive baseline: repeat the last observed week"""
+    season = train_values[-7:] if len(train_values) >= 7 else np.array([train_values.mean()])
+    return np.resize(season, len(test_dates)).astype(float)
+
+BACKTEST_ENGINES = {
+    "prophet": _prophet_predict,
+    "naive": _naive_predict,
+}
+
+def daily_series(dates: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reindex a series to one row per calendar day, with zero sales on days
+    it has no row for, so fold sizes and the seasonal lag count days
+    """
+    if len(dates) == 0:
+        return dates, values
+    span = int((dates[-1] - dates[0]).astype(np.int64)) + 1
+    if span == len(dates):
+        return dates, values
+    calendar = np.arange(dates[0], dates[0] + np.timedelta64(span, "D"), dtype="datetime64[D]")
+    dense = np.zeros(span, dtype=np.float64)
+    dense[(dates - dates[0]).astype(np.int64)] = values
+    return calendar, dense
+
+def rolling_origins(n_points: int, initial: int, horizon: int, step: int, max_folds: int) -> List[int]:
+    """Cutoff indices for rolling-origin evaluation, keeping the latest `max_folds` origins"""
+    cutoffs = list(range(n_points - horizon, initial - 1, -step))[:max_folds]
+    return sorted(cutoffs)
+
+def accuracy_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, Optional[float]]:
+    """MAPE over non-zero actuals, WAPE and relative bias (positive = over-forecast)"""
+    if len(actual) == 0:
+        return {"mape": None, "wape": None, "bias": None}
+    errors = predicted - actual
+    total = np.abs(actual).sum()
+    nonzero = actual != 0
+    return {
+        "mape": float(np.mean(np.abs(errors[nonzero] / actual[nonzero]))) if nonzero.any() else None,
+        "wape": float(np.abs(errors).sum() / total) if total else None,
+        "bias": float(errors.sum() / total) if total else None,
+    }
+
+def backtest_series(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Run rolling-origin cross-validation for one product and every requested
+    engine. The series is sliced from the memory-mapped sales snapshot and
+    filled out to a daily calendar (days without sales are zero) only when it
+    has gaps; training and test windows are views of it, so nothing is copied
+    per fold.
+    """
+    dates, values = daily_series(*SalesSnapshot.open_path(task["snapshot"]).series(task["product_id"]))
+    cutoffs = rolling_origins(len(values), task["initial"], task["horizon"], task["step"], task["max_folds"])
+
+    results = []
+    for engine in task["engines"]:
+        predict = BACKTEST_ENGINES[engine]
+        actual, predicted = [], []
+        for cutoff in cutoffs:
+            test = slice(cutoff, cutoff + task["horizon"])
+            try:
+                predicted.append(np.clip(predict(dates[:cutoff], values[:cutoff], dates[test]), 0, None))
+                actual.append(values[test])
+            except Exception as e:
+                print(f"Backtest fold failed for product {task['product_id']} ({engine}): {e}")
+        metrics = accuracy_metrics(
+            np.concatenate(actual) if actual else np.array([]),
+            np.concatenate(predicted) if predicted else np.array([]),
+        )
+        results.append({
+            "product_id": task["product_id"],
+            "engine": engine,
+            "horizon": task["horizon"],
+            "folds": len(actual),
+            **metrics,
+        })
+    return results
+
+class BacktestService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def run(
+        self,
+        product_ids: Optional[List[int]] = None,
+        engines: Iterable[str] = ("prophet",),
+        horizon: Optional[int] = None,
+        max_folds: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Backtest every product across a process pool and store the metrics.
+        Sales are exported once to this run's own memory-mapped snapshot, which
+        the workers map read-only; tasks only carry the product ID and
+        snapshot path. The snapshot is removed when the run finishes.
+        """
+        engines = list(engines)
+        unknown = [e for e in engines if e not in BACKTEST_ENGINES]
+        if unknown:
+            raise ValueError(f"Unknown backtest engines: {', '.join(unknown)}")
+
+        horizon = horizon or settings.BACKTEST_HORIZON_DAYS
+        snapshot = SalesSnapshot.export(self.db, settings.SALES_SNAPSHOT_DIR, product_ids)
+        try:
+            metrics = self._run_tasks(snapshot, engines, horizon, max_folds, workers)
+        finally:
+            snapshot.remove()
+        if metrics:
+            self.db.execute(insert(ForecastMetric), metrics)
+            self.db.commit()
+        return metrics
+
+    def _run_tasks(
+        self,
+        snapshot: SalesSnapshot,
+        engines: List[str],
+        horizon: int,
+        max_folds: Optional[int],
+        workers: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        tasks = [
+            {
+                "product_id": int(product_id),
+                "snapshot": snapshot.path,
+                "engines": engines,
+                "initial": settings.BACKTEST_INITIAL_DAYS,
+                "horizon": horizon,
+                "step": settings.BACKTEST_STEP_DAYS,
+                "max_folds": max_folds or settings.BACKTEST_MAX_FOLDS,
+            }
+            for product_id in snapshot.product_ids
+        ]
+        if not tasks:
+            return []
+
+        workers = workers or settings.BACKTEST_WORKERS or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            return [row for rows in pool.map(backtest_series, tasks, chunksize=chunksize) for row in rows]
+
+    def scorecard(self, engine: Optional[str] = None) -> Dict[str, Any]:
+        """Latest metrics per product and engine, plus a per-engine average"""
+        latest_ids = select(func.max(ForecastMetric.id)).group_by(ForecastMetric.product_id, ForecastMetric.engine)
+        if engine:
+            latest_ids = latest_ids.where(ForecastMetric.engine == engine)
+        latest = self.db.scalars(
+            select(ForecastMetric)
+            .where(ForecastMetric.id.in_(latest_ids))
+            .order_by(ForecastMetric.engine, ForecastMetric.product_id)
+        ).all()
+
+        summary = self.db.execute(
+            select(
+                ForecastMetric.engine,
+                func.count(ForecastMetric.id),
+                func.avg(ForecastMetric.mape),
+                func.avg(ForecastMetric.wape),
+                func.avg(ForecastMetric.bias),
+            )
+            .where(ForecastMetric.id.in_(latest_ids))
+            .group_by(ForecastMetric.engine)
+            .order_by(ForecastMetric.engine)
+        ).all()
+        return {
+            "engines": [
+                {"engine": name, "products": count, "mape": mape, "wape": wape, "bias": bias}
+                for name, count, mape, wape, bias in summary
+            ],
+            "products": latest,
+        }
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Run rolling-origin backtests for the product catalog")
+    parser.add_argument("--engines", nargs="+", default=["prophet", "naive"], choices=sorted(BACKTEST_ENGINES))
+    parser.add_argument("--products", nargs="+", type=int, help="Product IDs (default: all with sales)")
+    parser.add_argument("--horizon", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        BacktestService(db).run(args.products, args.engines, horizon=args.horizon, workers=args.workers)
+        for score in BacktestService(db).scorecard()["engines"]:
+            metrics = " ".join(
+                f"{name.upper()}={'n/a' if score[name] is None else round(score[name], 3)}"
+                for name in ("mape", "wape", "bias")
+            )
+            print(f"{score['engine']:<10} products={score['products']:<6} {metrics}")
+    finally:
+        db.close()
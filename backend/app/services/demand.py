@@ -0,0 +1,81 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.forecast import Forecast, latest_forecasts
+from app.db.models.product import CategorySettings, Product
+
+def planning_params(db: Session, product_ids: Optional[Iterable[int]] = None) -> Dict[int, Tuple[int, int]]:
+    """
+    (alert horizon, lead time) in days per product: the product's own value,
+    else its category's, else the settings default
+    """
+    query = (
+        select(
+            Product.id,
+            func.coalesce(Product.alert_horizon_days, CategorySettings.alert_horizon_days),
+            func.coalesce(Product.lead_time_days, CategorySettings.lead_time_days),
+        )
+        .outerjoin(CategorySettings, CategorySettings.category == Product.category)
+    )
+    if product_ids is not None:
+        query = query.where(Product.id.in_(list(product_ids)))
+    return {
+        product_id: (horizon or settings.ALERT_HORIZON_DAYS, lead_time or settings.DEFAULT_LEAD_TIME_DAYS)
+        for product_id, horizon, lead_time in db.execute(query)
+    }
+
+def forecast_demand(db: Session, horizons: Dict[int, int], today: Optional[date] = None) -> Dict[int, float]:
+    """
+    Forecast demand per product over its horizon (today and the following
+    horizon - 1 days), from the latest run's cumulative totals: only the
+    rows at today and at each horizon end are read, whatever the horizon.
+
+    Products whose run has no row at today or at the horizon end (weekly or
+    monthly runs, gaps, runs ending early) or whose rows predate the
+    cumulative column are summed over the window instead.
+    """
+    today = today or datetime.now().date()
+    if not horizons:
+        return {}
+    product_ids = list(horizons)
+    end_dates = {product_id: today + timedelta(days=horizon - 1) for product_id, horizon in horizons.items()}
+
+    rows = db.execute(
+        latest_forecasts(Forecast.product_id, Forecast.date, Forecast.predicted_qty, Forecast.cumulative_qty)
+        .where(Forecast.product_id.in_(product_ids), Forecast.date.in_(sorted({today, *end_dates.values()})))
+    ).all()
+    start_rows, end_rows = {}, {}
+    for product_id, row_date, predicted_qty, cumulative_qty in rows:
+        if row_date == today:
+            start_rows[product_id] = (predicted_qty, cumulative_qty)
+        if row_date == end_dates[product_id]:
+            end_rows[product_id] = cumulative_qty
+
+    demand, fallback = {}, defaultdict(list)
+    for product_id, horizon in horizons.items():
+        end = end_rows.get(product_id)
+        start_qty, start_cumulative = start_rows.get(product_id, (None, None))
+        if end is None or start_cumulative is None:
+            fallback[horizon].append(product_id)
+            continue
+        demand[product_id] = end - start_cumulative + (start_qty or 0.0)
+
+    # One range sum per distinct horizon for the products the lookup could not answer
+    for horizon, ids in fallback.items():
+        totals = dict(db.execute(
+            latest_forecasts(Forecast.product_id, func.sum(Forecast.predicted_qty))
+            .where(
+                Forecast.product_id.in_(ids),
+                Forecast.date >= today,
+                Forecast.date < today + timedelta(days=horizon),
+            )
+            .group_by(Forecast.product_id)
+        ).all())
+        for product_id in ids:
+            demand[product_id] = totals.get(product_id) or 0.0
+    return demand
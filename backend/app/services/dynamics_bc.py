@@ -3,6 +3,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from app.core.config import settings
+from app.core.metrics import BC_FETCH_ERRORS, BC_FETCH_RECORDS, BC_FETCH_SECONDS
 
 class DynamicsBCService:
     def __init__(self):
@@ -29,7 +30,8 @@ class DynamicsBCService:
         }
         
         try:
-            response = requests.post(token_url, data=payload)
+            with BC_FETCH_SECONDS.labels("token").time():
+                response = requests.post(token_url, data=payload)
             response.raise_for_status()
             
             token_data = response.json()
@@ -38,6 +40,7 @@ class DynamicsBCService:
             
             return self.access_token
         except requests.exceptions.RequestException as e:
+            BC_FETCH_ERRORS.labels("token").inc()
             print(f"Error getting Dynamics BC token: {e}")
             # In a real app, raise a specific exception or handle appropriately
             raise Exception("Failed to authenticate with Dynamics BC")
@@ -53,10 +56,15 @@ class DynamicsBCService:
         """Get all items (products) from Dynamics BC"""
         url = f"{self.base_url}/v2.0/{self.environment}/api/v2.0/companies({self.company_id})/items"
         try:
-            response = requests.get(url, headers=self._get_headers())
+            headers = self._get_headers()
+            with BC_FETCH_SECONDS.labels("items").time():
+                response = requests.get(url, headers=headers)
             response.raise_for_status()
-            return response.json().get('value', [])
+            items = response.json().get('value', [])
+            BC_FETCH_RECORDS.labels("items").inc(len(items))
+            return items
         except requests.exceptions.RequestException as e:
+            BC_FETCH_ERRORS.labels("items").inc()
             print(f"Error fetching items from Dynamics BC: {e}")
             return []
     
@@ -64,10 +72,13 @@ class DynamicsBCService:
         """Get a specific item by ID"""
         url = f"{self.base_url}/v2.0/{self.environment}/api/v2.0/companies({self.company_id})/items({item_id})"
         try:
-            response = requests.get(url, headers=self._get_headers())
+            headers = self._get_headers()
+            with BC_FETCH_SECONDS.labels("item").time():
+                response = requests.get(url, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
+            BC_FETCH_ERRORS.labels("item").inc()
             print(f"Error fetching item {item_id} from Dynamics BC: {e}")
             return None
     
@@ -91,10 +102,15 @@ class DynamicsBCService:
             params['$filter'] = filter_str
         
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            headers = self._get_headers()
+            with BC_FETCH_SECONDS.labels("item_ledger_entries").time():
+                response = requests.get(url, headers=headers, params=params)
             response.raise_for_status()
-            return response.json().get('value', [])
+            entries = response.json().get('value', [])
+            BC_FETCH_RECORDS.labels("item_ledger_entries").inc(len(entries))
+            return entries
         except requests.exceptions.RequestException as e:
+            BC_FETCH_ERRORS.labels("item_ledger_entries").inc()
             print(f"Error fetching item ledger entries from Dynamics BC: {e}")
             return []
     
@@ -109,7 +125,9 @@ class DynamicsBCService:
             if item_id:
                 # Fetch inventory for a specific item
                 item_url = f"{base_item_url}({item_id})"
-                response = requests.get(item_url, headers=self._get_headers(), params={'$expand': 'itemInventory'})
+                headers = self._get_headers()
+                with BC_FETCH_SECONDS.labels("inventory").time():
+                    response = requests.get(item_url, headers=headers, params={'$expand': 'itemInventory'})
                 response.raise_for_status()
                 item_data = response.json()
                 # Extract inventory info (adjust field names as needed)
@@ -121,7 +139,9 @@ class DynamicsBCService:
                 inventory_data.append(inventory_info)
             else:
                 # Fetch inventory for all items (might need pagination in real app)
-                response = requests.get(base_item_url, headers=self._get_headers(), params={'$expand': 'itemInventory'})
+                headers = self._get_headers()
+                with BC_FETCH_SECONDS.labels("inventory").time():
+                    response = requests.get(base_item_url, headers=headers, params={'$expand': 'itemInventory'})
                 response.raise_for_status()
                 items = response.json().get('value', [])
                 for item_data in items:
@@ -131,8 +151,10 @@ class DynamicsBCService:
                         'quantityOnHand': item_data.get('inventory', 0) # Example field
                     }
                     inventory_data.append(inventory_info)
+            BC_FETCH_RECORDS.labels("inventory").inc(len(inventory_data))
             return inventory_data
         except requests.exceptions.RequestException as e:
+            BC_FETCH_ERRORS.labels("inventory").inc()
             print(f"Error fetching inventory levels from Dynamics BC: {e}")
             return []
 
@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Forecasting engines are registered by name with a loader that performs the
+# (slow) import on first use, so API workers that never forecast don't pay for
+# pandas/cmdstanpy/Stan at startup.
+_loaders: Dict[str, Callable[[], Any]] = {}
+_warmups: Dict[str, Callable[[Any], None]] = {}
+_engines: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+def register_engine(name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None) -> None:
+    """Register a forecasting engine loader and an optional warm-up routine"""
+    _loaders[name] = loader
+    if warmup is not None:
+        _warmups[name] = warmup
+
+def get_engine(name: str) -> Any:
+    """Return the engine registered under `name`, loading it on first use"""
+    engine = _engines.get(name)
+    if engine is not None:
+        return engine
+    if name not in _loaders:
+        raise ValueError(f"Unknown forecasting engine '{name}'")
+    with _lock:
+        if name not in _engines:
+            _engines[name] = _loaders[name]()
+        return _engines[name]
+
+def is_loaded(name: str) -> bool:
+    return name in _engines
+
+def prewarm(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Load the given engines (all registered engines by default) and run their
+    warm-up routine so the first real forecast doesn't pay for imports and
+    model compilation. Returns the seconds spent per engine.
+    """
+    timings = {}
+    for name in names if names is not None else list(_loaders):
+        start = time.perf_counter()
+        engine = get_engine(name)
+        warmup = _warmups.get(name)
+        if warmup is not None:
+            warmup(engine)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+def _load_prophet() -> Any:
+    from prophet import Prophet
+    return Prophet
+
+def _warmup_prophet(prophet_cls: Any) -> None:
+    """Fit a tiny series so the Stan model and backend are loaded in this process"""
+    import pandas as pd
+
+    df = pd.DataFrame({
+        "ds": pd.date_range("2020-01-01", periods=30, freq="D"),
+        "y": [float(i % 7) for i in range(30)],
+    })
+    model = prophet_cls(yearly_seasonality=False, weekly_seasonality=True, daily_seasonality=False)
+    model.fit(df)
+    model.predict(model.make_future_dataframe(periods=1))
+
+register_engine("prophet", _load_prophet, _warmup_prophet)
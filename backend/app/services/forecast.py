@@ -1,20 +1,78 @@
-import pandas as pd
-import numpy as np
-from prophet import Prophet
-from typing import List, Dict, Any, Optional
+import gc
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from statistics import NormalDist
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.events import ALERTS_CHANGED, FORECAST_SAVED, event_bus
+from app.core.metrics import (
+    ALERT_EVALUATION_SECONDS, ALERTS_CREATED, FORECAST_FAILURES, FORECAST_FIT_SECONDS,
+    FORECAST_PREDICT_SECONDS, FORECAST_SAVE_SECONDS,
+)
+from app.db.change_tracking import changed_product_ids, changed_products_filter
+
 from app.db.models.sales import CleanSales
 from app.db.models.product import Product
-from app.db.models.forecast import Forecast
+from app.db.models.forecast import Forecast, ForecastRun, LatestForecast
+from app.db.models.inventory import InventoryPolicy
+from app.services.demand import forecast_demand, planning_params
+from app.services.sales_snapshot import SalesSnapshot
+from app.db.models.alert import OPEN_ALERT_STATUSES, StockAlert
+from app.services.engines import get_engine
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Called with (products done, total products or None when unknown)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+# StockAlert columns included in alerts_changed events
+ALERT_EVENT_FIELDS = ("id", "product_id", "alert_type", "message", "status", "created_at")
+
+INTERVAL_MODES = ("none", "analytical", "sampling")
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux only, None elsewhere)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
 
 class ForecastService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        interval_mode: Optional[str] = None,
+        uncertainty_samples: Optional[int] = None,
+        snapshot: Optional[SalesSnapshot] = None,
+    ):
         self.db = db
+        self.snapshot = snapshot  # Read daily sales from a memory-mapped snapshot instead of the database
+        self.interval_mode = interval_mode or settings.FORECAST_INTERVAL_MODE
+        self.uncertainty_samples = uncertainty_samples or settings.FORECAST_UNCERTAINTY_SAMPLES
+        if self.interval_mode not in INTERVAL_MODES:
+            raise ValueError(f"Unknown forecast interval mode '{self.interval_mode}'")
     
-    def _prepare_data(self, product_id: int) -> Optional[pd.DataFrame]:
+    def _prepare_data(self, product_id: int) -> Optional["pd.DataFrame"]:
         """Prepare sales data for Prophet forecasting"""
+        import pandas as pd
+
+        if self.snapshot is not None:
+            series = self.snapshot.series(product_id)
+            if series is None or len(series[0]) < 5:
+                print(f"Not enough sales data for product {product_id} to generate forecast.")
+                return None
+            return pd.DataFrame({"ds": series[0], "y": series[1]})
+
         sales = self.db.query(CleanSales).filter(CleanSales.product_id == product_id).order_by(CleanSales.date).all()
         
         if not sales or len(sales) < 5: # Need minimum data points for Prophet
@@ -27,6 +85,32 @@ class ForecastService:
         # Prophet requires 'ds' (date) and 'y' (value) columns
         return df
     
+    @contextmanager
+    def _batch_snapshot(self, product_ids: Optional[List[int]]):
+        """
+        Read a batch's sales from one exported snapshot instead of a query per
+        product. The snapshot is removed after the batch; a snapshot given to
+        the service is used as is.
+        """
+        if self.snapshot is not None:
+            yield
+            return
+        self.snapshot = SalesSnapshot.export(self.db, settings.SALES_SNAPSHOT_DIR, product_ids)
+        try:
+            yield
+        finally:
+            self.snapshot.remove()
+            self.snapshot = None
+
+    def _sales_read_at(self) -> datetime:
+        """
+        When the sales about to be fit were read: the snapshot's export time,
+        else now, taken before reading so changes made during the fit stay pending
+        """
+        if self.snapshot is not None:
+            return self.snapshot.created_at
+        return datetime.now()
+
     def generate_forecast(self, product_id: int, periods: int = 30, frequency: str = 'D') -> List[Dict[str, Any]]:
         """Generate forecast for a specific product"""
         # Get sales data
@@ -35,116 +119,518 @@ class ForecastService:
         if df is None:
             return []
         
+        return self._fit_predict(df, periods, frequency, label=f"product {product_id}")
+
+    def _fit_predict(self, df: "pd.DataFrame", periods: int, frequency: str, label: str = "series") -> List[Dict[str, Any]]:
+        """Fit Prophet on a ds/y history and return the future periods with interval bounds"""
         try:
-            # Initialize and fit Prophet model
+            # Initialize and fit Prophet model; Monte Carlo draws are only
+            # made in "sampling" mode since they dominate predict time
+            Prophet = get_engine("prophet")
             model = Prophet(
                 yearly_seasonality=True,
                 weekly_seasonality=True,
                 daily_seasonality=False, # Usually false for daily sales data unless specific daily patterns exist
-                seasonality_mode='multiplicative' # Or 'additive' depending on data characteristics
+                seasonality_mode='multiplicative', # Or 'additive' depending on data characteristics
+                interval_width=settings.FORECAST_INTERVAL_WIDTH,
+                uncertainty_samples=self.uncertainty_samples if self.interval_mode == "sampling" else 0,
             )
             
-            model.fit(df)
+            with FORECAST_FIT_SECONDS.labels("prophet").time():
+                model.fit(df)
             
             # Create future dataframe
             future = model.make_future_dataframe(periods=periods, freq=frequency)
             
             # Generate forecast
-            forecast = model.predict(future)
+            with FORECAST_PREDICT_SECONDS.labels("prophet").time():
+                forecast = model.predict(future)
             
             # Extract relevant columns for the future periods
-            result = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(periods)
+            result = forecast.tail(periods)
+            yhat = result['yhat'].to_numpy()
+            if self.interval_mode == "sampling":
+                lower = result['yhat_lower'].to_numpy()
+                upper = result['yhat_upper'].to_numpy()
+            elif self.interval_mode == "analytical":
+                lower, upper = self._analytical_bounds(model, forecast, yhat)
+            else:
+                lower = upper = None
             
             # Convert to list of dictionaries
             forecast_data = []
-            for _, row in result.iterrows():
+            for i, ds in enumerate(result['ds']):
                 forecast_data.append({
-                    "date": row['ds'].date(),
-                    "predicted_qty": max(0, round(row['yhat'], 2)),  # Ensure non-negative
-                    "lower_bound": max(0, round(row['yhat_lower'], 2)),
-                    "upper_bound": max(0, round(row['yhat_upper'], 2))
+                    "date": ds.date(),
+                    "predicted_qty": max(0, round(float(yhat[i]), 2)),  # Ensure non-negative
+                    "lower_bound": max(0, round(float(lower[i]), 2)) if lower is not None else None,
+                    "upper_bound": max(0, round(float(upper[i]), 2)) if upper is not None else None,
                 })
             
             return forecast_data
         except Exception as e:
-            print(f"Error generating forecast for product {product_id}: {e}")
+            FORECAST_FAILURES.labels("prophet").inc()
+            print(f"Error generating forecast for {label}: {e}")
             return []
+
+    def _analytical_bounds(self, model: Any, forecast: "pd.DataFrame", yhat: "np.ndarray"):
+        """
+        Normal approximation of the prediction interval: in-sample residual
+        spread, widened with the distance from the end of the history.
+        """
+        import numpy as np
+
+        fitted = model.history[['ds', 'y']].merge(forecast[['ds', 'yhat']], on='ds')
+        sigma = float(np.std(fitted['y'].to_numpy() - fitted['yhat'].to_numpy()))
+        z = NormalDist().inv_cdf(0.5 + settings.FORECAST_INTERVAL_WIDTH / 2)
+        steps = np.arange(1, len(yhat) + 1)
+        half_width = z * sigma * np.sqrt(1 + steps / max(len(fitted), 1))
+        return yhat - half_width, yhat + half_width
     
-    def save_forecast(self, product_id: int, forecast_data: List[Dict[str, Any]]) -> List[Forecast]:
-        """Save forecast data to database"""
-        # Delete existing future forecasts for this product to avoid duplicates
-        # Assuming we only store future forecasts
+    def save_forecast(self, product_id: int, forecast_data: List[Dict[str, Any]], fitted_at: Optional[datetime] = None) -> ForecastRun:
+        """
+        Save forecast data as a new immutable run and make it the product's
+        latest version. Earlier runs are kept for history.
+        `fitted_at` is when the sales behind the forecast were read; sales
+        changed after it keep the product marked for re-forecasting.
+        """
+        start = time.perf_counter()
         today = datetime.now().date()
-        self.db.query(Forecast).filter(Forecast.product_id == product_id, Forecast.date >= today).delete()
-        
-        # Create new forecast records
-        forecasts = []
-        for data in forecast_data:
-            # Only save future forecasts
-            if data["date"] >= today:
-                forecast = Forecast(
-                    product_id=product_id,
-                    date=data["date"],
-                    predicted_qty=data["predicted_qty"]
-                )
-                self.db.add(forecast)
-                forecasts.append(forecast)
-        
+        run = ForecastRun(product_id=product_id, interval_mode=self.interval_mode)
+        self.db.add(run)
+        self.db.flush()
+
+        # Only save future forecasts, in a single batched insert, with their running total
+        rows, cumulative_qty = [], 0.0
+        for data in sorted((data for data in forecast_data if data["date"] >= today), key=lambda data: data["date"]):
+            cumulative_qty += data["predicted_qty"]
+            rows.append({
+                "run_id": run.id,
+                "product_id": product_id,
+                "date": data["date"],
+                "predicted_qty": data["predicted_qty"],
+                "lower_bound": data.get("lower_bound"),
+                "upper_bound": data.get("upper_bound"),
+                "cumulative_qty": cumulative_qty,
+            })
+        if rows:
+            self.db.execute(insert(Forecast), rows)
+        self.db.merge(LatestForecast(product_id=product_id, run_id=run.id))
+        self.db.execute(
+            update(Product).where(Product.id == product_id).values(forecasted_at=fitted_at or datetime.now())
+        )
         self.db.commit()
-        # Refresh objects to get IDs, etc.
-        for f in forecasts: 
-            self.db.refresh(f)
-        return forecasts
+        FORECAST_SAVE_SECONDS.observe(time.perf_counter() - start)
+        event_bus.publish(FORECAST_SAVED, product_ids=[product_id])
+        return run
     
-    def generate_and_save_forecasts(self, product_ids: Optional[List[int]] = None, periods: int = 30, frequency: str = 'D') -> Dict[int, List[Dict[str, Any]]]:
-        """Generate and save forecasts for multiple products"""
-        if product_ids is None:
+    def generate_and_save_forecasts(
+        self,
+        product_ids: Optional[List[int]] = None,
+        periods: int = 30,
+        frequency: str = 'D',
+        changed_only: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Generate and save forecasts for multiple products, reading their sales
+        from one snapshot. With changed_only, only products whose sales
+        changed since their last forecast are refit.
+        on_progress is called with (products done, total) after each product.
+        """
+        if changed_only:
+            product_ids = sorted(changed_product_ids(self.db, product_ids))
+        elif product_ids is None:
             # Get all product IDs
             products = self.db.query(Product.id).all()
             product_ids = [p.id for p in products]
         
         results = {}
-        for product_id in product_ids:
-            forecast_data = self.generate_forecast(product_id, periods, frequency)
-            if forecast_data:
-                self.save_forecast(product_id, forecast_data)
-                results[product_id] = forecast_data
+        with self._batch_snapshot(product_ids):
+            for done, product_id in enumerate(product_ids, 1):
+                fitted_at = self._sales_read_at()
+                forecast_data = self.generate_forecast(product_id, periods, frequency)
+                if forecast_data:
+                    self.save_forecast(product_id, forecast_data, fitted_at=fitted_at)
+                    results[product_id] = forecast_data
+                if on_progress is not None:
+                    on_progress(done, len(product_ids))
         
         return results
+
+    def _product_id_chunks(self, product_ids: Optional[List[int]], changed_only: bool, chunk_size: int):
+        """
+        Yield product IDs a chunk at a time. Without explicit IDs the catalog
+        is paged by primary key so the full ID list is never held in memory.
+        The caller may send() a new chunk size before each following chunk.
+        """
+        if product_ids is not None:
+            if changed_only:
+                product_ids = sorted(changed_product_ids(self.db, product_ids))
+            start = 0
+            while start < len(product_ids):
+                chunk = product_ids[start:start + chunk_size]
+                start += len(chunk)
+                chunk_size = (yield chunk) or chunk_size
+            return
+
+        last_id = 0
+        while True:
+            query = select(Product.id).where(Product.id > last_id).order_by(Product.id).limit(chunk_size)
+            if changed_only:
+                query = query.where(changed_products_filter())
+            chunk = list(self.db.scalars(query))
+            if not chunk:
+                return
+            last_id = chunk[-1]
+            chunk_size = (yield chunk) or chunk_size
+
+    def stream_forecasts(
+        self,
+        product_ids: Optional[List[int]] = None,
+        periods: int = 30,
+        frequency: str = 'D',
+        changed_only: bool = False,
+        chunk_size: Optional[int] = None,
+        max_rss_mb: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate and save forecasts chunk by chunk, keeping only counters.
+        Each chunk's sales are read from a snapshot of that chunk, and the
+        chunk is written as it completes and its objects are released before
+        the next one starts. When RSS exceeds max_rss_mb, a full
+        collection runs and the chunk size is halved to slow intake.
+        on_progress is called with (products done, total) after each product;
+        the total is None when the products are not known up front.
+        """
+        chunk_size = chunk_size or settings.FORECAST_CHUNK_SIZE
+        max_rss_mb = max_rss_mb or settings.FORECAST_MAX_RSS_MB
+        summary = {"products": 0, "forecasted": 0, "chunks": 0, "chunk_size": chunk_size, "peak_rss_mb": None}
+
+        # Known up front only for an explicit list that is not filtered further
+        total = len(product_ids) if product_ids is not None and not changed_only else None
+        chunks = self._product_id_chunks(product_ids, changed_only, chunk_size)
+        chunk = next(chunks, None)
+        while chunk is not None:
+            with self._batch_snapshot(chunk):
+                for product_id in chunk:
+                    fitted_at = self._sales_read_at()
+                    forecast_data = self.generate_forecast(product_id, periods, frequency)
+                    if forecast_data:
+                        self.save_forecast(product_id, forecast_data, fitted_at=fitted_at)
+                        summary["forecasted"] += 1
+                    del forecast_data
+                    summary["products"] += 1
+                    if on_progress is not None:
+                        on_progress(summary["products"], total)
+            summary["chunks"] += 1
+
+            # Drop the chunk's runs from the identity map and collect Prophet/pandas cycles
+            self.db.expunge_all()
+            gc.collect()
+            rss = current_rss_mb()
+            if rss is not None:
+                summary["peak_rss_mb"] = round(max(rss, summary["peak_rss_mb"] or 0), 1)
+                if max_rss_mb and rss > max_rss_mb and chunk_size > 1:
+                    chunk_size = max(1, chunk_size // 2)
+                    print(f"Forecast RSS {rss:.0f} MB over {max_rss_mb} MB ceiling, chunk size now {chunk_size}")
+            try:
+                chunk = chunks.send(chunk_size)
+            except StopIteration:
+                chunk = None
+
+        summary["chunk_size"] = chunk_size
+        return summary
+    
+    def _category_shares(self, categories: Optional[List[str]], window_days: int) -> "pd.DataFrame":
+        """
+        Each product's share of its category's sales over the recent window.
+        Categories without recent sales are split evenly between their products.
+        """
+        import pandas as pd
+
+        cutoff = datetime.now().date() - timedelta(days=window_days)
+        query = (
+            select(Product.id, Product.category, func.coalesce(func.sum(CleanSales.quantity), 0))
+            .outerjoin(CleanSales, and_(CleanSales.product_id == Product.id, CleanSales.date >= cutoff))
+            .where(Product.category.isnot(None))
+            .group_by(Product.id, Product.category)
+        )
+        if categories:
+            query = query.where(Product.category.in_(categories))
+
+        shares = pd.DataFrame(self.db.execute(query).all(), columns=["product_id", "category", "recent_qty"])
+        grouped = shares.groupby("category")["recent_qty"]
+        totals = grouped.transform("sum")
+        counts = grouped.transform("count")
+        shares["share"] = (shares["recent_qty"] / totals.where(totals > 0)).fillna(1 / counts)
+        return shares
+
+    def generate_hierarchical_forecasts(
+        self,
+        categories: Optional[List[str]] = None,
+        periods: int = 30,
+        frequency: str = 'D',
+        share_window_days: Optional[int] = None,
+        reconcile_top_n: int = 0,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Fit one model per category on aggregated sales and split the category
+        forecast down to products by their recent share of category sales.
+        With reconcile_top_n, the top sellers of each category get their own
+        fit and the remaining category demand is spread over the other products.
+        """
+        import numpy as np
+        import pandas as pd
+
+        share_window_days = share_window_days or settings.HIERARCHY_SHARE_WINDOW_DAYS
+        fitted_at = datetime.now()
+
+        query = (
+            select(Product.category, CleanSales.date, func.sum(CleanSales.quantity))
+            .join(Product, Product.id == CleanSales.product_id)
+            .where(Product.category.isnot(None))
+            .group_by(Product.category, CleanSales.date)
+            .order_by(Product.category, CleanSales.date)
+        )
+        if categories:
+            query = query.where(Product.category.in_(categories))
+        history = pd.DataFrame(self.db.execute(query).all(), columns=["category", "ds", "y"])
+        shares = self._category_shares(categories, share_window_days)
+
+        results = {}
+        for category, category_history in history.groupby("category"):
+            if len(category_history) < 5:  # Same minimum as per-product forecasts
+                print(f"Not enough sales data for category {category} to generate forecast.")
+                continue
+            category_forecast = self._fit_predict(
+                category_history[["ds", "y"]], periods, frequency, label=f"category {category}"
+            )
+            if not category_forecast:
+                continue
+
+            members = shares[shares["category"] == category].sort_values("recent_qty", ascending=False)
+            dates = [row["date"] for row in category_forecast]
+            # rows: predicted, lower, upper; bounds are absent in "none" interval mode
+            has_bounds = category_forecast[0]["lower_bound"] is not None
+            totals = np.array([
+                [row["predicted_qty"] for row in category_forecast],
+                [row["lower_bound"] or 0 for row in category_forecast],
+                [row["upper_bound"] or 0 for row in category_forecast],
+            ])
+
+            product_forecasts = {}
+            top_ids = members["product_id"].head(reconcile_top_n).tolist() if reconcile_top_n else []
+            for product_id in top_ids:
+                own_forecast = self.generate_forecast(product_id, periods, frequency)
+                if own_forecast:
+                    product_forecasts[product_id] = own_forecast
+            if product_forecasts:
+                # Subtract each own fit on the category's dates; days it does not cover count as zero
+                reconciled = sum(
+                    pd.DataFrame(f)
+                    .set_index("date")[["predicted_qty", "lower_bound", "upper_bound"]]
+                    .astype(float)
+                    .fillna(0)
+                    .reindex(dates, fill_value=0)
+                    .to_numpy()
+                    .T
+                    for f in product_forecasts.values()
+                )
+                totals = np.clip(totals - reconciled, 0, None)
+                members = members[~members["product_id"].isin(product_forecasts.keys())]
+
+            # Remaining category demand goes to the other products by their renormalized share,
+            # or evenly when none of them sold recently
+            member_shares = members["share"].to_numpy(dtype=float)
+            if member_shares.sum() > 0:
+                member_shares = member_shares / member_shares.sum()
+            elif len(member_shares):
+                member_shares = np.full(len(member_shares), 1 / len(member_shares))
+
+            # (products x 3 x periods) in one broadcast
+            split = np.round(np.clip(member_shares[:, None, None] * totals[None, :, :], 0, None), 2)
+            for product_id, values in zip(members["product_id"].tolist(), split):
+                product_forecasts[product_id] = [
+                    {
+                        "date": day,
+                        "predicted_qty": float(values[0, i]),
+                        "lower_bound": float(values[1, i]) if has_bounds else None,
+                        "upper_bound": float(values[2, i]) if has_bounds else None,
+                    }
+                    for i, day in enumerate(dates)
+                ]
+
+            for product_id, forecast_data in product_forecasts.items():
+                self.save_forecast(product_id, forecast_data, fitted_at=fitted_at)
+                results[product_id] = forecast_data
+
+        return results
     
-    def check_stock_alerts(self) -> List[Dict[str, Any]]:
-        """Check for products that need reordering based on forecasts"""
+    def check_stock_alerts(self, product_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Check for products (all, or the given ones) that need reordering based on forecasts.
+        Products with a computed inventory policy alert when stock is below
+        their reorder point; the others use the manual reorder threshold.
+        Usage is forecast over each product's alert horizon (its own, its
+        category's or ALERT_HORIZON_DAYS), read from cumulative forecast totals.
+        """
+        start = time.perf_counter()
+        if product_ids is not None:
+            product_ids = list(product_ids)
         alerts = []
-        today = datetime.now().date()
         
-        # Get all products
-        products = self.db.query(Product).all()
+        # Forecasted usage over each product's horizon for all products at once
+        horizons = {product_id: horizon for product_id, (horizon, _) in planning_params(self.db, product_ids).items()}
+        usage_by_product = forecast_demand(self.db, horizons)
         
-        for product in products:
-            # Get forecast for the next 7 days (or relevant period)
-            forecast_period_end = today + timedelta(days=7)
-            forecasts = self.db.query(Forecast).filter(
-                Forecast.product_id == product.id,
-                Forecast.date >= today,
-                Forecast.date <= forecast_period_end
-            ).all()
-            
-            # Calculate forecasted usage for the period
-            forecasted_usage = sum(f.predicted_qty for f in forecasts)
+        # Get the products with their inventory policy, if any
+        products_query = select(Product, InventoryPolicy).outerjoin(InventoryPolicy, InventoryPolicy.product_id == Product.id)
+        if product_ids is not None:
+            products_query = products_query.where(Product.id.in_(product_ids))
+        products = self.db.execute(products_query).all()
+        
+        for product, policy in products:
+            stock_level = product.stock_level or 0
+            forecasted_usage = usage_by_product.get(product.id) or 0.0
             
             # Calculate minimum expected stock level at the end of the period
-            min_expected_stock = product.stock_level - forecasted_usage
+            min_expected_stock = stock_level - forecasted_usage
             
-            # Check if below reorder threshold
-            if min_expected_stock < product.reorder_threshold:
+            # Check if below the reorder point, or the manual threshold without a policy
+            if policy is not None:
+                needs_reorder = stock_level < policy.reorder_point
+            else:
+                needs_reorder = min_expected_stock < (product.reorder_threshold or 0)
+            
+            if needs_reorder:
                 alerts.append({
                     "product_id": product.id,
                     "product_name": product.name,
-                    "current_stock": product.stock_level,
-                    "forecasted_usage_next_7_days": round(forecasted_usage, 2),
-                    "min_expected_stock_next_7_days": round(min_expected_stock, 2),
-                    "reorder_threshold": product.reorder_threshold
+                    "current_stock": stock_level,
+                    "horizon_days": horizons.get(product.id, settings.ALERT_HORIZON_DAYS),
+                    "forecasted_usage": round(forecasted_usage, 2),
+                    "min_expected_stock": round(min_expected_stock, 2),
+                    "reorder_threshold": product.reorder_threshold,
+                    "reorder_point": policy.reorder_point if policy is not None else None,
+                    "suggested_order_qty": policy.order_qty if policy is not None else None
                 })
         
+        ALERT_EVALUATION_SECONDS.observe(time.perf_counter() - start)
         return alerts
+    
+    def create_stock_alerts(self, potential_alerts: List[Dict[str, Any]]) -> List[StockAlert]:
+        """Create low stock alerts for the given alert situations unless one is already open"""
+        if not potential_alerts:
+            return []
+        # A concurrent evaluation may open some of the same alerts first; the unique
+        # open-alert index rejects the batch, and the retry skips those products
+        for _ in range(2):
+            created_alerts = self._new_stock_alerts(potential_alerts)
+            if not created_alerts:
+                return []
+            try:
+                self.db.flush()
+                # Captured before the commit expires the rows, for event subscribers
+                alert_rows = [
+                    {column: getattr(alert, column) for column in ALERT_EVENT_FIELDS}
+                    for alert in created_alerts
+                ]
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                continue
+            except Exception as e:
+                self.db.rollback()
+                print(f"Error committing new stock alerts: {e}")
+                return []
+            ALERTS_CREATED.inc(len(created_alerts))
+            print(f"Created {len(created_alerts)} new low stock alerts.")
+            event_bus.publish(
+                ALERTS_CHANGED,
+                product_ids=[row["product_id"] for row in alert_rows],
+                created=[row["id"] for row in alert_rows],
+                resolved=[],
+                alerts=alert_rows,
+            )
+            return created_alerts
+        print("Error committing new stock alerts: conflicting concurrent alert evaluation")
+        return []
 
+    def _new_stock_alerts(self, potential_alerts: List[Dict[str, Any]]) -> List[StockAlert]:
+        """Add an alert for each situation whose product has no open low stock alert"""
+        created_alerts = []
+        # Products that already have an open alert, in one query
+        alerted_ids = set(self.db.scalars(
+            select(StockAlert.product_id).where(
+                StockAlert.product_id.in_([alert_data["product_id"] for alert_data in potential_alerts]),
+                StockAlert.alert_type == "low_stock",
+                StockAlert.status.in_(OPEN_ALERT_STATUSES),
+            )
+        ))
+        for alert_data in potential_alerts:
+            if alert_data["product_id"] in alerted_ids:
+                continue
+            if alert_data.get("reorder_point") is not None:
+                alert_message = (
+                    f"Product {alert_data['product_name']} (ID: {alert_data['product_id']}) "
+                    f"is below its reorder point ({alert_data['reorder_point']:.2f}). "
+                    f"Current: {alert_data['current_stock']:.2f}, "
+                    f"Forecasted usage ({alert_data['horizon_days']}d): {alert_data['forecasted_usage']:.2f}, "
+                    f"Suggested order quantity: {alert_data['suggested_order_qty']:.0f}."
+                )
+            else:
+                alert_message = (
+                    f"Product {alert_data['product_name']} (ID: {alert_data['product_id']}) "
+                    f"is forecasted to drop below reorder threshold ({alert_data['reorder_threshold']}). "
+                    f"Current: {alert_data['current_stock']:.2f}, "
+                    f"Forecasted usage ({alert_data['horizon_days']}d): {alert_data['forecasted_usage']:.2f}, "
+                    f"Min expected stock ({alert_data['horizon_days']}d): {alert_data['min_expected_stock']:.2f}."
+                )
+            alert = StockAlert(
+                product_id=alert_data["product_id"],
+                alert_type="low_stock",
+                message=alert_message,
+                status="new",
+                created_at=datetime.now(),
+            )
+            self.db.add(alert)
+            created_alerts.append(alert)
+            # The same product listed twice in one batch gets one alert
+            alerted_ids.add(alert_data["product_id"])
+        return created_alerts
+
+    def refresh_stock_alerts(self, product_ids: Iterable[int]) -> Dict[str, List[int]]:
+        """
+        Re-evaluate low stock alerts for the given products only: open alerts
+        for those that now need reordering and resolve the open alerts of
+        those that no longer do
+        """
+        product_ids = list(product_ids)
+        potential_alerts = self.check_stock_alerts(product_ids)
+        created = self.create_stock_alerts(potential_alerts)
+
+        alerting = {alert_data["product_id"] for alert_data in potential_alerts}
+        cleared = [product_id for product_id in product_ids if product_id not in alerting]
+        open_alerts = []
+        if cleared:
+            open_alerts = self.db.execute(
+                select(StockAlert.id, StockAlert.product_id).where(
+                    StockAlert.product_id.in_(cleared),
+                    StockAlert.alert_type == "low_stock",
+                    StockAlert.status.in_(OPEN_ALERT_STATUSES),
+                )
+            ).all()
+        resolved = [alert_id for alert_id, _ in open_alerts]
+        if resolved:
+            self.db.execute(update(StockAlert).where(StockAlert.id.in_(resolved)).values(status="resolved"))
+            self.db.commit()
+            event_bus.publish(
+                ALERTS_CHANGED,
+                product_ids=sorted({product_id for _, product_id in open_alerts}),
+                created=[],
+                resolved=resolved,
+                alerts=[],
+            )
+        return {"created": [alert.id for alert in created], "resolved": resolved}
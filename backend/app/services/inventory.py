@@ -0,0 +1,262 @@
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timedelta
+from statistics import NormalDist
+
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import STOCK_CHANGED, event_bus
+from app.db.models.forecast import Forecast, latest_forecasts
+from app.db.models.inventory import InventoryPolicy
+from app.db.models.product import CategorySettings, Product
+from app.db.upsert import upsert_rows
+
+def service_level_z(service_levels: np.ndarray) -> np.ndarray:
+    """Standard normal quantile for each service level (computed once per distinct level)"""
+    levels, inverse = np.unique(service_levels, return_inverse=True)
+    z = np.array([NormalDist().inv_cdf(min(max(level, 0.5), 0.9999)) for level in levels])
+    return z[inverse]
+
+def interval_sigma(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Daily demand standard deviation recovered from the stored forecast interval bounds"""
+    interval_z = NormalDist().inv_cdf(0.5 + settings.FORECAST_INTERVAL_WIDTH / 2)
+    return np.nan_to_num((upper - lower) / (2 * interval_z))
+
+def sync_stock_levels(db: Session, stock_levels: Dict[int, int]) -> Dict[str, Any]:
+    """
+    Write stock levels reported by an external inventory system in one
+    batched update, then publish the change so only these products'
+    alerts are re-checked
+    """
+    existing = set(db.scalars(select(Product.id).where(Product.id.in_(list(stock_levels))))) if stock_levels else set()
+    rows = [{"id": product_id, "stock_level": level} for product_id, level in stock_levels.items() if product_id in existing]
+    if rows:
+        db.execute(update(Product), rows)
+        db.commit()
+        event_bus.publish(STOCK_CHANGED, product_ids=[row["id"] for row in rows])
+    return {
+        "updated": len(rows),
+        "missing": sorted(product_id for product_id in stock_levels if product_id not in existing),
+        "synced_at": datetime.now(),
+    }
+
+class InventoryOptimizer:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def optimize(self, product_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Compute safety stock, reorder point and suggested order quantity for
+        every product in one vectorized pass over the latest forecasts, and
+        store them as inventory policies.
+
+        Daily demand is taken as normal with the forecast as mean and a
+        standard deviation recovered from the stored interval bounds, so
+        lead-time demand has variance equal to the sum of the daily variances.
+        """
+        today = datetime.now().date()
+        query = (
+            select(
+                Product.id,
+                Product.stock_level,
+                func.coalesce(Product.lead_time_days, CategorySettings.lead_time_days),
+                Product.service_level,
+            )
+            .outerjoin(CategorySettings, CategorySettings.category == Product.category)
+            .order_by(Product.id)
+        )
+        if product_ids is not None:
+            query = query.where(Product.id.in_(product_ids))
+        products = self.db.execute(query).all()
+        if not products:
+            return {"products": 0, "computed_at": datetime.now()}
+
+        ids = np.array([p[0] for p in products])
+        stock = np.array([p[1] or 0 for p in products], dtype=float)
+        lead_time = np.array([p[2] or settings.DEFAULT_LEAD_TIME_DAYS for p in products])
+        service_level = np.array([p[3] or settings.DEFAULT_SERVICE_LEVEL for p in products], dtype=float)
+
+        window = int(lead_time.max()) + settings.REVIEW_PERIOD_DAYS
+        forecast_query = latest_forecasts(
+            Forecast.product_id, Forecast.date, Forecast.predicted_qty, Forecast.lower_bound, Forecast.upper_bound
+        ).where(Forecast.date >= today, Forecast.date < today + timedelta(days=window))
+        if product_ids is not None:
+            forecast_query = forecast_query.where(Forecast.product_id.in_(product_ids))
+        rows = self.db.execute(forecast_query).all()
+
+        n = len(ids)
+        if rows:
+            row_ids = np.array([r[0] for r in rows])
+            keep = np.isin(row_ids, ids)
+            idx = np.searchsorted(ids, row_ids[keep])
+            offset = (np.array([r[1] for r in rows], dtype="datetime64[D]")[keep] - np.datetime64(today, "D")).astype(int)
+            mean = np.array([r[2] or 0 for r in rows], dtype=float)[keep]
+            lower = np.array([np.nan if r[3] is None else r[3] for r in rows], dtype=float)[keep]
+            upper = np.array([np.nan if r[4] is None else r[4] for r in rows], dtype=float)[keep]
+            sigma = interval_sigma(lower, upper)
+
+            in_lead_time = offset < lead_time[idx]
+            in_review = ~in_lead_time & (offset < lead_time[idx] + settings.REVIEW_PERIOD_DAYS)
+            lead_time_demand = np.bincount(idx, weights=mean * in_lead_time, minlength=n)
+            lead_time_variance = np.bincount(idx, weights=sigma ** 2 * in_lead_time, minlength=n)
+            review_demand = np.bincount(idx, weights=mean * in_review, minlength=n)
+            has_forecast = np.bincount(idx, minlength=n) > 0
+        else:
+            lead_time_demand = lead_time_variance = review_demand = np.zeros(n)
+            has_forecast = np.zeros(n, dtype=bool)
+
+        safety_stock = service_level_z(service_level) * np.sqrt(lead_time_variance)
+        reorder_point = lead_time_demand + safety_stock
+        order_qty = np.maximum(0, np.ceil(reorder_point + review_demand - stock))
+
+        # Products without a forecast keep alerting on their manual threshold
+        computed_at = datetime.now()
+        policies = [
+            {
+                "product_id": int(product_id),
+                "lead_time_days": int(lt),
+                "service_level": float(sl),
+                "lead_time_demand": round(float(ltd), 2),
+                "safety_stock": round(float(ss), 2),
+                "reorder_point": round(float(rop), 2),
+                "order_qty": float(qty),
+                "computed_at": computed_at,
+            }
+            for product_id, lt, sl, ltd, ss, rop, qty, forecasted in zip(
+                ids, lead_time, service_level, lead_time_demand, safety_stock, reorder_point, order_qty, has_forecast
+            )
+            if forecasted
+        ]
+        upsert_rows(self.db, InventoryPolicy, policies, ["product_id"])
+        self.db.commit()
+        return {"products": len(policies), "computed_at": computed_at}
+
+class StockoutSimulator:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _forecast_matrices(self, ids: np.ndarray, today: date, days: int, product_ids: Optional[List[int]]):
+        """
+        Dense (products x days) mean and sigma of daily demand from the latest
+        forecasts, which products have forecast rows, and which of those have
+        rows on consecutive days (a daily run)
+        """
+        query = latest_forecasts(
+            Forecast.product_id, Forecast.date, Forecast.predicted_qty, Forecast.lower_bound, Forecast.upper_bound
+        ).where(Forecast.date >= today, Forecast.date < today + timedelta(days=days))
+        if product_ids is not None:
+            query = query.where(Forecast.product_id.in_(product_ids))
+        rows = self.db.execute(query).all()
+
+        mean = np.zeros((len(ids), days), dtype=np.float32)
+        sigma = np.zeros((len(ids), days), dtype=np.float32)
+        has_forecast = np.zeros(len(ids), dtype=bool)
+        daily = np.ones(len(ids), dtype=bool)
+        if rows:
+            row_ids = np.array([r[0] for r in rows])
+            keep = np.isin(row_ids, ids)
+            idx = np.searchsorted(ids, row_ids[keep])
+            offset = (np.array([r[1] for r in rows], dtype="datetime64[D]")[keep] - np.datetime64(today, "D")).astype(int)
+            lower = np.array([np.nan if r[3] is None else r[3] for r in rows], dtype=float)[keep]
+            upper = np.array([np.nan if r[4] is None else r[4] for r in rows], dtype=float)[keep]
+            mean[idx, offset] = np.array([r[2] or 0 for r in rows], dtype=float)[keep]
+            sigma[idx, offset] = interval_sigma(lower, upper)
+            has_forecast[idx] = True
+            # Weekly or monthly runs leave gaps between rows, which would simulate as zero demand
+            first = np.full(len(ids), days)
+            last = np.full(len(ids), -1)
+            np.minimum.at(first, idx, offset)
+            np.maximum.at(last, idx, offset)
+            daily = ~has_forecast | (np.bincount(idx, minlength=len(ids)) == last - first + 1)
+        return mean, sigma, has_forecast, daily
+
+    def simulate(
+        self,
+        product_ids: Optional[List[int]] = None,
+        horizons: Optional[List[int]] = None,
+        paths: Optional[int] = None,
+        demand_scale: float = 1.0,
+        stock_levels: Optional[Dict[int, float]] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Monte Carlo stockout risk for every forecasted product over each horizon.
+
+        Daily demand is sampled as normal with the forecast as mean and the
+        sigma recovered from its interval bounds (clipped at zero), and each
+        path stocks out on the first day its cumulative demand exceeds the
+        stock level. All products are simulated together as one
+        (products x paths x days) array, in chunks of products (and of paths
+        when one product's paths are too many) that keep it under
+        STOCKOUT_SIMULATION_MAX_CELLS. demand_scale and stock_levels override
+        the forecast and current stock for what-if runs. Products whose latest
+        run is not daily are skipped.
+        """
+        horizons = sorted(set(horizons or settings.STOCKOUT_SIMULATION_HORIZONS))
+        paths = paths or settings.STOCKOUT_SIMULATION_PATHS
+        days = horizons[-1]
+        today = datetime.now().date()
+        simulated_at = datetime.now()
+
+        query = select(Product.id, Product.stock_level).order_by(Product.id)
+        if product_ids is not None:
+            query = query.where(Product.id.in_(product_ids))
+        products = self.db.execute(query).all()
+        result = {
+            "paths": paths,
+            "horizons": horizons,
+            "simulated_at": simulated_at,
+            "products": [],
+            "skipped_product_ids": [],
+        }
+        if not products:
+            return result
+
+        ids = np.array([p[0] for p in products])
+        stock = np.array([p[1] or 0 for p in products], dtype=np.float32)
+        for product_id, level in (stock_levels or {}).items():
+            position = np.searchsorted(ids, product_id)
+            if position < len(ids) and ids[position] == product_id:
+                stock[position] = level
+
+        mean, sigma, has_forecast, daily = self._forecast_matrices(ids, today, days, product_ids)
+        result["skipped_product_ids"] = [int(product_id) for product_id in ids[has_forecast & ~daily]]
+        keep = has_forecast & daily
+        ids, stock, mean, sigma = ids[keep], stock[keep], mean[keep], sigma[keep]
+        mean *= demand_scale
+        sigma *= demand_scale
+
+        rng = np.random.default_rng(seed)
+        first_stockout = np.empty((len(ids), paths), dtype=np.int32)
+        chunk = max(1, settings.STOCKOUT_SIMULATION_MAX_CELLS // (paths * days))
+        path_chunk = min(paths, max(1, settings.STOCKOUT_SIMULATION_MAX_CELLS // days))
+        for start in range(0, len(ids), chunk):
+            end = min(start + chunk, len(ids))
+            for path_start in range(0, paths, path_chunk):
+                path_end = min(path_start + path_chunk, paths)
+                demand = rng.standard_normal((end - start, path_end - path_start, days), dtype=np.float32)
+                demand *= sigma[start:end, None, :]
+                demand += mean[start:end, None, :]
+                np.maximum(demand, 0, out=demand)
+                np.cumsum(demand, axis=2, out=demand)
+                out = demand > stock[start:end, None, None]
+                # Day index of the first stockout on each path, `days` when it never runs out
+                first_stockout[start:end, path_start:path_end] = np.where(out.any(axis=2), out.argmax(axis=2), days)
+
+        probabilities = np.stack([(first_stockout < h).mean(axis=1) for h in horizons], axis=1)
+        stocked_out = first_stockout < days
+        counts = stocked_out.sum(axis=1)
+        expected_day = np.where(stocked_out, first_stockout, 0).sum(axis=1) / np.maximum(counts, 1)
+
+        result["products"] = [
+            {
+                "product_id": int(product_id),
+                "stock_level": float(level),
+                "stockout_probability": [round(float(p), 4) for p in probability],
+                "expected_stockout_date": today + timedelta(days=int(round(day))) if count else None,
+            }
+            for product_id, level, probability, day, count in zip(ids, stock, probabilities, expected_day, counts)
+        ]
+        return result
@@ -0,0 +1,191 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from graphlib import TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import PIPELINE_PROGRESS, event_bus
+from app.core.metrics import PIPELINE_RUNS, PIPELINE_STAGE_PRODUCTS, PIPELINE_STAGE_SECONDS
+from app.db.models.sales import RawSales
+from app.db.session import SessionLocal
+from app.services.dynamics_bc import DynamicsBCService
+from app.services.forecast import ForecastService
+from app.services.sales_ingest import process_and_save_sales
+
+# A stage receives the session, the shared run context and the union of the
+# product IDs affected by its upstream stages (None for root stages), and
+# returns the product IDs it affected.
+StageFunc = Callable[[Session, Dict[str, Any], Optional[Set[int]]], Set[int]]
+
+class Stage:
+    def __init__(self, name: str, func: StageFunc, depends_on: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+class Pipeline:
+    """
+    Runs stages in dependency order. A stage whose upstream stages affected
+    no products is skipped, so the work done scales with what changed.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        graph = {stage.name: set(stage.depends_on) for stage in stages}
+        missing = {dep for deps in graph.values() for dep in deps} - set(graph)
+        if missing:
+            raise ValueError(f"Unknown pipeline dependencies: {', '.join(sorted(missing))}")
+        self.order = list(TopologicalSorter(graph).static_order())  # Raises CycleError on cycles
+
+    def run(self, db: Session, context: Dict[str, Any]) -> Dict[str, Any]:
+        affected: Dict[str, Set[int]] = {}
+        report = {"started_at": datetime.now(), "stages": {}}
+        for name in self.order:
+            stage = self.stages[name]
+            product_ids = set().union(*(affected[dep] for dep in stage.depends_on)) if stage.depends_on else None
+            if product_ids is not None and not product_ids:
+                affected[name] = set()
+                report["stages"][name] = {"status": "skipped", "products": 0, "seconds": 0.0}
+                event_bus.publish(PIPELINE_PROGRESS, stage=name, **report["stages"][name])
+                continue
+
+            start = time.perf_counter()
+            affected[name] = set(stage.func(db, context, product_ids))
+            seconds = time.perf_counter() - start
+            PIPELINE_STAGE_SECONDS.labels(name).observe(seconds)
+            PIPELINE_STAGE_PRODUCTS.labels(name).inc(len(affected[name]))
+            report["stages"][name] = {
+                "status": "completed",
+                "products": len(affected[name]),
+                "seconds": round(seconds, 3),
+            }
+            event_bus.publish(PIPELINE_PROGRESS, stage=name, **report["stages"][name])
+        report["finished_at"] = datetime.now()
+        return report
+
+def ingest_stage(db: Session, context: Dict[str, Any], product_ids: Optional[Set[int]]) -> Set[int]:
+    """Fetch ledger entries for complete days since the last ingested day"""
+    start_date, end_date = context["start_date"], context["end_date"]
+    if start_date > end_date:
+        context["sales_records"] = []
+        return set()
+
+    records = DynamicsBCService().get_item_ledger_entries(
+        start_date=start_date.isoformat(), end_date=end_date.isoformat()
+    )
+    context["sales_records"] = records
+    # Item IDs that map onto product IDs; the clean stage does the full validation
+    return {int(r["itemId"]) for r in records if str(r.get("itemId", "")).isdigit()}
+
+def clean_stage(db: Session, context: Dict[str, Any], product_ids: Optional[Set[int]]) -> Set[int]:
+    """Map, validate and persist the fetched entries as raw and clean sales"""
+    return process_and_save_sales(db, context.pop("sales_records", []))
+
+def forecast_stage(db: Session, context: Dict[str, Any], product_ids: Optional[Set[int]]) -> Set[int]:
+    results = ForecastService(db).generate_and_save_forecasts(
+        product_ids=sorted(product_ids), periods=context["forecast_periods"]
+    )
+    return set(results)
+
+def alert_stage(db: Session, context: Dict[str, Any], product_ids: Optional[Set[int]]) -> Set[int]:
+    forecast_service = ForecastService(db)
+    created = forecast_service.create_stock_alerts(forecast_service.check_stock_alerts(product_ids))
+    return {alert.product_id for alert in created}
+
+def default_pipeline() -> Pipeline:
+    return Pipeline([
+        Stage("ingest", ingest_stage),
+        Stage("clean", clean_stage, depends_on=["ingest"]),
+        Stage("forecast", forecast_stage, depends_on=["clean"]),
+        Stage("alert", alert_stage, depends_on=["forecast"]),
+    ])
+
+def ingest_watermark(db: Session) -> Optional[date]:
+    """Latest day with ingested sales; read from the database so every worker and restart agrees"""
+    return db.scalar(select(func.max(RawSales.date)))
+
+class PipelineRunner:
+    """Runs the pipeline at most once at a time and keeps a history of its runs"""
+
+    def __init__(self, pipeline: Optional[Pipeline] = None, history_size: int = 20):
+        self.pipeline = pipeline or default_pipeline()
+        self.history: List[Dict[str, Any]] = []
+        self.history_size = history_size
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self) -> Optional[Dict[str, Any]]:
+        """Run the pipeline once; returns None if a run is already in progress"""
+        if not self._lock.acquire(blocking=False):
+            print("Pipeline run skipped: previous run still in progress.")
+            return None
+        db = SessionLocal()
+        try:
+            # Only complete days are ingested. The last stored day is fetched again in case
+            # it was only partly imported; entries already stored are skipped by ledger entry ID.
+            end_date = date.today() - timedelta(days=1)
+            watermark = ingest_watermark(db)
+            if watermark is not None:
+                start_date = watermark
+            else:
+                start_date = end_date - timedelta(days=settings.PIPELINE_INITIAL_LOOKBACK_DAYS - 1)
+            context = {
+                "start_date": start_date,
+                "end_date": end_date,
+                "forecast_periods": settings.PIPELINE_FORECAST_PERIODS,
+            }
+
+            try:
+                report = self.pipeline.run(db, context)
+                report["status"] = "completed"
+            except Exception as e:
+                db.rollback()
+                print(f"Pipeline run failed: {e}")
+                report = {"status": "failed", "error": str(e), "finished_at": datetime.now()}
+
+            PIPELINE_RUNS.labels(report["status"]).inc()
+            event_bus.publish(
+                PIPELINE_PROGRESS,
+                stage=None,
+                status=report["status"],
+                products=report.get("stages", {}).get("ingest", {}).get("products", 0),
+            )
+            report["window"] = {"start_date": start_date, "end_date": end_date}
+            self.history = (self.history + [report])[-self.history_size:]
+            return report
+        finally:
+            db.close()
+            self._lock.release()
+
+pipeline_runner = PipelineRunner()
+
+_scheduler = None
+
+def start_scheduler() -> None:
+    """Run the pipeline every PIPELINE_INTERVAL_MINUTES in a background thread"""
+    global _scheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    _scheduler = BackgroundScheduler()
+    _scheduler.add_job(
+        pipeline_runner.run,
+        "interval",
+        minutes=settings.PIPELINE_INTERVAL_MINUTES,
+        id="resupply_pipeline",
+        max_instances=1,
+        coalesce=True,
+    )
+    _scheduler.start()
+
+def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
@@ -0,0 +1,167 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import STOCK_CHANGED, event_bus
+from app.db.models.product import Product
+from app.schemas.product import ProductBulkItem, ProductCreate
+
+BULK_MODES = ("create", "update", "upsert")
+
+# Columns a row may not set to null; an explicit null there is treated as unset
+NON_NULLABLE_FIELDS = ("name", "stock_level", "reorder_threshold")
+
+def parse_ndjson(body: bytes) -> List[Any]:
+    """
+    Parse newline-delimited JSON. Lines that fail to parse are returned as
+    the exception so they can be reported per row instead of failing the batch.
+    """
+    rows = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError as e:
+            rows.append(e)
+    return rows
+
+def _format_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+        )
+    return str(error)
+
+# (row index, column values for an update, full record for an insert or None)
+ValidRow = Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]
+
+class ProductBulkService:
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+
+    def _validate(self, row: Any, mode: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Validate a single row. Returns the column values to update an
+        existing product with, and the full record to insert when the row
+        creates one (None when it cannot).
+        """
+        if isinstance(row, Exception):
+            raise row
+        if not isinstance(row, dict):
+            raise ValueError("Row must be a JSON object")
+        if mode == "create":
+            record = ProductCreate(**row).model_dump()
+            return record, record
+
+        item = ProductBulkItem(**row)
+        if item.id is None:
+            if mode == "update":
+                raise ValueError("id is required for update")
+            # Upsert rows without an id are new products and need a full record
+            record = ProductCreate(**row).model_dump()
+            return record, record
+
+        changes = {
+            field: value
+            for field, value in item.model_dump(exclude_unset=True).items()
+            if value is not None or field not in NON_NULLABLE_FIELDS
+        }
+        record = None
+        if mode == "upsert":
+            # An unknown id is inserted under that id, which needs a full record
+            try:
+                record = {"id": item.id, **ProductCreate(**row).model_dump()}
+            except ValidationError:
+                record = None
+        return changes, record
+
+    def _apply_chunk(self, chunk: List[ValidRow], mode: str, result: Dict[str, Any]) -> None:
+        """Apply one chunk of validated rows in a single transaction"""
+        ids = [data["id"] for _, data, _ in chunk if data.get("id") is not None]
+        existing = set(self.db.scalars(select(Product.id).where(Product.id.in_(ids)))) if ids else set()
+
+        inserts, updates, errors = [], [], []
+        for index, data, record in chunk:
+            product_id = data.get("id")
+            if mode == "create" or product_id is None:
+                inserts.append(record)
+            elif product_id in existing:
+                updates.append(data)
+            elif mode == "upsert" and record is not None:
+                inserts.append(record)
+                existing.add(product_id)
+            elif mode == "upsert":
+                errors.append({
+                    "index": index,
+                    "id": product_id,
+                    "error": "Product not found and row is not a complete product",
+                })
+            else:
+                errors.append({"index": index, "id": product_id, "error": "Product not found"})
+
+        if inserts:
+            self.db.execute(insert(Product), inserts)
+            if any("id" in record for record in inserts):
+                self._sync_id_sequence()
+        if updates:
+            self.db.execute(update(Product), updates)
+        self.db.commit()
+        if updates:
+            event_bus.publish(STOCK_CHANGED, product_ids=[data["id"] for data in updates])
+
+        result["created"] += len(inserts)
+        result["updated"] += len(updates)
+        result["errors"].extend(errors)
+
+    def _sync_id_sequence(self) -> None:
+        """After inserting explicit ids, move the Postgres id sequence past them"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text(
+                "SELECT setval(pg_get_serial_sequence('products', 'id'), (SELECT MAX(id) FROM products))"
+            ))
+
+    def apply(self, rows: List[Any], mode: str) -> Dict[str, Any]:
+        """
+        Create, update or upsert products in chunked transactions.
+        Invalid rows are reported with their index and skipped; if a chunk
+        fails to write, its rows are retried one by one to isolate the bad ones.
+        """
+        if mode not in BULK_MODES:
+            raise ValueError(f"Unknown bulk mode '{mode}'")
+
+        result = {"mode": mode, "received": len(rows), "created": 0, "updated": 0, "failed": 0, "errors": []}
+
+        valid: List[ValidRow] = []
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, *self._validate(row, mode)))
+            except (ValidationError, ValueError, TypeError) as e:
+                # Only a well-formed id is echoed back; a malformed one is what the error is about
+                row_id = row.get("id") if isinstance(row, dict) else None
+                if not isinstance(row_id, int) or isinstance(row_id, bool):
+                    row_id = None
+                result["errors"].append({"index": index, "id": row_id, "error": _format_error(e)})
+
+        for start in range(0, len(valid), self.chunk_size):
+            chunk = valid[start:start + self.chunk_size]
+            try:
+                self._apply_chunk(chunk, mode, result)
+            except Exception as e:
+                self.db.rollback()
+                print(f"Bulk product chunk at row {chunk[0][0]} failed, retrying rows individually: {e}")
+                for index, data, record in chunk:
+                    try:
+                        self._apply_chunk([(index, data, record)], mode, result)
+                    except Exception as row_error:
+                        self.db.rollback()
+                        result["errors"].append({"index": index, "id": data.get("id"), "error": str(row_error)})
+
+        result["errors"].sort(key=lambda err: err["index"])
+        result["failed"] = len(result["errors"])
+        return result
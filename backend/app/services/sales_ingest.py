@@ -0,0 +1,122 @@
+import time
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List, Set
+from datetime import date
+
+from app.core.metrics import INGEST_ROWS, INGEST_SECONDS
+
+from app.db.models.sales import RawSales as RawSalesModel, CleanSales as CleanSalesModel
+from app.db.models.product import Product
+
+def process_and_save_sales(db: Session, sales_data: List[dict]) -> Set[int]:
+    """
+    Map, validate and save Dynamics BC ledger entries as raw and clean sales.
+    Entries already stored under their ledger entry ID are skipped, so a
+    window can be fetched again safely. Returns the IDs of the products
+    that received new sales; raises if the sales could not be committed.
+    """
+    start = time.perf_counter()
+    raw_count = 0
+    clean_count = 0
+    processed_ids = set()
+    affected_product_ids = set()
+
+    # Get existing product IDs from the database for validation
+    existing_product_ids = {p.id for p in db.query(Product.id).all()}
+    entry_ids = list({str(sale["id"]) for sale in sales_data if sale.get("id")})
+    stored_entry_ids = set(db.scalars(
+        select(RawSalesModel.ledger_entry_id).where(RawSalesModel.ledger_entry_id.in_(entry_ids))
+    )) if entry_ids else set()
+
+    for sale in sales_data:
+        # Map Dynamics BC fields to our model
+        # Adjust field mappings based on actual Dynamics BC API response
+        # Assuming 'itemId' from BC corresponds to our 'product_id'
+        # Assuming 'postingDate' is the sale date
+        # Assuming 'quantity' represents sales quantity (needs to be positive)
+        # Assuming 'entryType' indicates if it's a sale
+        
+        try:
+            # Use .get() with defaults to handle potentially missing keys
+            bc_item_id_str = sale.get("itemId") # BC Item ID might be a GUID string
+            # Find corresponding internal product ID. Requires a mapping or matching logic.
+            # For this example, we'll try to find a product with a matching name or number if ID fails.
+            # This mapping logic needs refinement based on how BC items relate to your Product model.
+            product_id = None
+            if bc_item_id_str:
+                 # Simplistic: Assume internal ID matches BC ID for now. Needs proper mapping.
+                 # product = db.query(Product).filter(Product.dynamics_bc_id == bc_item_id_str).first()
+                 # if product: product_id = product.id
+                 # TEMPORARY: If ID is numeric string, try converting
+                 try:
+                     potential_id = int(bc_item_id_str)
+                     if potential_id in existing_product_ids:
+                         product_id = potential_id
+                 except ValueError:
+                     pass # BC ID might not be an integer
+
+            if not product_id:
+                # print(f"Skipping sale: Could not map BC item ID ")
+                continue # Skip if product mapping fails
+
+            sale_date_str = sale.get("postingDate", "")
+            if not sale_date_str:
+                continue
+            sale_date = date.fromisoformat(sale_date_str.split("T")[0])
+            
+            quantity = abs(int(sale.get("quantity", 0)))
+            entry_type = sale.get("entryType")
+
+            # Skip non-sales entries or zero quantity
+            if quantity <= 0 or entry_type != "Sale":
+                continue
+
+            # Skip entries stored by an earlier run and duplicates within this batch;
+            # entries without a ledger ID fall back to a (product, date, quantity) key
+            entry_id = str(sale["id"]) if sale.get("id") else None
+            if entry_id in stored_entry_ids:
+                continue
+            sale_key = entry_id or (product_id, sale_date, quantity)
+            if sale_key in processed_ids:
+                continue
+            processed_ids.add(sale_key)
+
+            # Save as raw sales
+            raw_sale = RawSalesModel(
+                product_id=product_id,
+                date=sale_date,
+                quantity=quantity,
+                ledger_entry_id=entry_id,
+            )
+            db.add(raw_sale)
+            raw_count += 1
+            
+            # Also save as clean sales (in a real app, apply cleaning logic here)
+            clean_sale = CleanSalesModel(
+                product_id=product_id,
+                date=sale_date,
+                quantity=quantity
+            )
+            db.add(clean_sale)
+            clean_count += 1
+            affected_product_ids.add(product_id)
+
+        except Exception as e:
+            print(f"Error processing sale record {sale.get('id', 'N/A')}: {e}")
+            # Optionally log the error and continue with the next record
+            continue
+
+    try:
+        db.commit()
+        print(f"Successfully committed {raw_count} raw and {clean_count} clean sales records.")
+    except Exception as e:
+        db.rollback()
+        print(f"Database commit failed: {e}")
+        INGEST_ROWS.labels("failed").inc(len(sales_data))
+        raise
+
+    INGEST_SECONDS.observe(time.perf_counter() - start)
+    INGEST_ROWS.labels("saved").inc(clean_count)
+    INGEST_ROWS.labels("skipped").inc(len(sales_data) - clean_count)
+    return affected_product_ids
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models.sales import CleanSales
+
+# A series is a pair of aligned arrays: dates (datetime64[D]) and quantities
+Series = Tuple[np.ndarray, np.ndarray]
+
+ARRAYS = ("product_ids", "offsets", "dates", "values")
+
+# Snapshots opened in this process, so each worker maps the files once
+_open_snapshots: Dict[str, "SalesSnapshot"] = {}
+
+class SalesSnapshot:
+    """
+    Daily sales per product as read-only memory-mapped NumPy arrays: one
+    contiguous dates/values pair for all products, sorted by product, and an
+    offsets index so product i's series is values[offsets[i]:offsets[i + 1]].
+    Slicing returns views into the mapped files, so processes that open the
+    same snapshot share the page cache instead of each holding a copy.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        self.product_ids = arrays["product_ids"]
+        self.offsets = arrays["offsets"]
+        self.dates = arrays["dates"]
+        self.values = arrays["values"]
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+
+    @property
+    def created_at(self) -> datetime:
+        """When the sales in this snapshot were read"""
+        return datetime.fromisoformat(self.meta["created_at"])
+
+    @classmethod
+    def export(cls, db: Session, directory: str, product_ids: Optional[List[int]] = None) -> "SalesSnapshot":
+        """
+        Write a new snapshot of clean sales with a single grouped query, into
+        a directory of its own under `directory`. Each run exports its own
+        snapshot, so concurrent runs never share files; the caller removes it
+        with remove() when done.
+        """
+        # Taken before reading, so sales written during the export count as after it
+        created_at = datetime.now()
+        query = (
+            select(CleanSales.product_id, CleanSales.date, func.sum(CleanSales.quantity))
+            .group_by(CleanSales.product_id, CleanSales.date)
+            .order_by(CleanSales.product_id, CleanSales.date)
+        )
+        if product_ids is not None:
+            query = query.where(CleanSales.product_id.in_(product_ids))
+        rows = db.execute(query).all()
+
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=np.int64)
+        arrays = {
+            "product_ids": ids[starts],
+            "offsets": np.r_[starts, len(ids)].astype(np.int64),
+            "dates": np.array([r[1] for r in rows], dtype="datetime64[D]"),
+            "values": np.array([r[2] for r in rows], dtype=np.float64),
+        }
+
+        os.makedirs(directory, exist_ok=True)
+        path = tempfile.mkdtemp(prefix=f"run-{created_at:%Y%m%d%H%M%S}-", dir=directory)
+        for array_name, array in arrays.items():
+            np.save(os.path.join(path, f"{array_name}.npy"), array)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"created_at": created_at.isoformat(), "products": len(starts), "rows": len(ids)}, f)
+        return cls(path)
+
+    @classmethod
+    def open_path(cls, path: str) -> "SalesSnapshot":
+        """Map a specific snapshot (once per process)"""
+        if path not in _open_snapshots:
+            _open_snapshots[path] = cls(path)
+        return _open_snapshots[path]
+
+    def remove(self) -> None:
+        """Delete this snapshot's files once its run is done"""
+        _open_snapshots.pop(self.path, None)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def __contains__(self, product_id: int) -> bool:
+        return self._index(product_id) is not None
+
+    def _index(self, product_id: int) -> Optional[int]:
+        i = int(np.searchsorted(self.product_ids, product_id))
+        if i < len(self.product_ids) and self.product_ids[i] == product_id:
+            return i
+        return None
+
+    def series(self, product_id: int) -> Optional[Series]:
+        """Zero-copy (dates, values) views for one product, or None without sales"""
+        i = self._index(product_id)
+        if i is None:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.dates[start:end], self.values[start:end]
+
+    def items(self) -> Iterator[Tuple[int, Series]]:
+        for i, product_id in enumerate(self.product_ids):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            yield int(product_id), (self.dates[start:end], self.values[start:end])
@@ -0,0 +1,77 @@
+"""
+Concurrent load test for the read endpoints.
+
+Runs N concurrent clients against one or more API deployments and reports
+p50/p99 latency per target, e.g. to compare the sync stack against the async one:
+
+    python benchmarks/load_test.py --token $TOKEN \
+        --target sync=http://localhost:8001/api/v1 \
+        --target async=http://localhost:8000/api/v1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+DEFAULT_PATHS = ["/products/", "/forecasts/", "/alerts/", "/sales/clean"]
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+async def run_client(client: httpx.AsyncClient, paths: List[str], requests: int, latencies: List[float], errors: List[int]):
+    for i in range(requests):
+        path = paths[i % len(paths)]
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def run_target(base_url: str, token: str, paths: List[str], concurrency: int, requests: int):
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            run_client(client, paths, requests, latencies, errors) for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare read endpoint latency under concurrent load")
+    parser.add_argument("--target", action="append", required=True, help="name=base_url, may be repeated")
+    parser.add_argument("--token", default="", help="Bearer token for authenticated endpoints")
+    parser.add_argument("--path", action="append", help="Endpoint path to hit (default: the main read endpoints)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    print(f"{'target':<12}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for target in args.target:
+        name, _, base_url = target.partition("=")
+        stats = asyncio.run(run_target(base_url, args.token, paths, args.concurrency, args.requests))
+        print(
+            f"{name:<12}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50']:>10.1f}{stats['p99']:>10.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Serialization benchmark for large list responses.
+
+Builds a forecast list of ORM-like rows and measures, per response class,
+the time FastAPI spends turning it into a response body: through the
+response model, as plain dicts (jsonable_encoder + render), and as a
+ORJSONResponse returned directly (render only). Also reports the payload
+size as indented, compact and gzipped JSON:
+
+    python benchmarks/serialization_benchmark.py --rows 10000 --runs 20
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.responses import ORJSONResponse
+from app.schemas.forecast import Forecast
+
+def make_rows(count: int) -> List[SimpleNamespace]:
+    """Attribute-style rows, like the ORM objects the endpoints return"""
+    start = date.today()
+    return [
+        SimpleNamespace(
+            id=i,
+            product_id=i // 90 + 1,
+            date=start + timedelta(days=i % 90),
+            predicted_qty=round(10 + (i % 17) * 0.37, 2),
+            lower_bound=round(8 + (i % 17) * 0.31, 2),
+            upper_bound=round(12 + (i % 17) * 0.43, 2),
+        )
+        for i in range(count)
+    ]
+
+def make_app(rows: List[SimpleNamespace], response_class) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/forecasts", response_model=List[Forecast])
+    def forecasts():
+        return rows
+
+    @app.get("/forecasts/raw")
+    def forecasts_raw():
+        # Endpoints returning plain dicts skip the response model
+        return [vars(row) for row in rows]
+
+    @app.get("/forecasts/direct")
+    def forecasts_direct():
+        # Returning the response instance skips jsonable_encoder entirely;
+        # only orjson can encode the dates without it
+        return ORJSONResponse([vars(row) for row in rows])
+
+    return app
+
+def measure(client: TestClient, path: str, runs: int):
+    samples, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(path, headers={"Accept-Encoding": "identity"})
+        samples.append((time.perf_counter() - start) * 1000)
+        size = len(response.content)
+    return samples, size
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure response serialization time and payload size")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"{args.rows} forecast rows, {args.runs} requests per case (in-process, no network)\n")
+    for label, response_class in (("JSONResponse", JSONResponse), ("ORJSONResponse", ORJSONResponse)):
+        client = TestClient(make_app(rows, response_class))
+        paths = ["/forecasts", "/forecasts/raw"] + (["/forecasts/direct"] if response_class is ORJSONResponse else [])
+        for path in paths:
+            client.get(path)  # Warm up
+            samples, size = measure(client, path, args.runs)
+            print(
+                f"{label:<16}{path:<18}median {statistics.median(samples):8.1f} ms  "
+                f"min {min(samples):8.1f} ms  body {size / 1024:8.1f} KB"
+            )
+
+    records = [Forecast.model_validate(row, from_attributes=True).model_dump(mode="json") for row in rows]
+    indented = json.dumps(records, indent=4).encode()
+    compact = json.dumps(records, separators=(",", ":")).encode()
+    print("\nPayload size")
+    for label, body in (
+        ("indent=4", indented),
+        ("compact", compact),
+        ("compact + gzip 6", gzip.compress(compact, compresslevel=6)),
+    ):
+        print(f"{label:<18}{len(body) / 1024:10.1f} KB")
+
+if __name__ == "__main__":
+    main()
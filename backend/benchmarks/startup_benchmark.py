@@ -0,0 +1,64 @@
+"""
+Startup benchmark for the API.
+
+Measures, in fresh interpreter processes, how long it takes to import the
+application (what every worker and every `--reload` pays) and how long a
+dedicated forecast worker spends pre-warming the forecasting engines:
+
+    python benchmarks/startup_benchmark.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_APP = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "prophet_loaded": "prophet" in sys.modules}))
+"""
+
+PREWARM = """
+import json, time
+from app.services import engines
+start = time.perf_counter()
+engines.prewarm()
+print(json.dumps({"seconds": time.perf_counter() - start, "prophet_loaded": True}))
+"""
+
+def measure(code: str, runs: int):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, check=True,
+            capture_output=True, text=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+def report(label: str, samples):
+    seconds = [s["seconds"] for s in samples]
+    print(
+        f"{label:<28}median {statistics.median(seconds):6.3f}s  "
+        f"min {min(seconds):6.3f}s  max {max(seconds):6.3f}s  "
+        f"prophet imported: {samples[0]['prophet_loaded']}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import and engine pre-warm time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-prewarm", action="store_true", help="Only measure the app import")
+    args = parser.parse_args()
+
+    report("import app.main", measure(IMPORT_APP, args.runs))
+    if not args.skip_prewarm:
+        report("engine pre-warm", measure(PREWARM, args.runs))
+
+if __name__ == "__main__":
+    main()
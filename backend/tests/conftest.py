@@ -0,0 +1,66 @@
+import os
+import tempfile
+from datetime import date, timedelta
+
+# Point the app at a throwaway SQLite database before any app module reads the settings
+_db_dir = tempfile.mkdtemp(prefix="resupply-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ["ALERT_EVENTS_ENABLED"] = "false"
+os.environ["PIPELINE_INTERVAL_MINUTES"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.base import Base
+from app.db.models.alert import StockAlert
+from app.db.models.product import Product
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services.forecast import ForecastService
+
+# Enough rows that a per-product query would show up in the counts
+SEED_PRODUCTS = 20
+SEED_FORECAST_DAYS = 30
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(bind=engine)
+    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def db(client):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    client.post("/api/v1/auth/register", json={"username": "tester", "email": "tester@example.com", "password": "secret"})
+    response = client.post("/api/v1/auth/login", data={"username": "tester", "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture(scope="session")
+def seeded(db):
+    """Products in a few categories, each with a saved forecast and an open alert"""
+    products = [
+        Product(name=f"Product {i}", category=f"Category {i % 4}", stock_level=i, reorder_threshold=10)
+        for i in range(SEED_PRODUCTS)
+    ]
+    db.add_all(products)
+    db.commit()
+
+    today = date.today()
+    forecast_service = ForecastService(db)
+    for product in products:
+        forecast_service.save_forecast(product.id, [
+            {"date": today + timedelta(days=day), "predicted_qty": 2.0, "lower_bound": 1.0, "upper_bound": 3.0}
+            for day in range(SEED_FORECAST_DAYS)
+        ])
+    db.add_all(
+        StockAlert(product_id=product.id, alert_type="low_stock", message="Stock below threshold", status="new")
+        for product in products
+    )
+    db.commit()
+    return products
@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.middleware import ExcludePathsMiddleware
+from app.main import STREAMING_PATHS, app as main_app
+
+def test_excluded_paths_skip_the_wrapped_middleware():
+    app = FastAPI()
+    app.add_middleware(ExcludePathsMiddleware, middleware=GZipMiddleware, exclude_paths={"/stream"}, minimum_size=1)
+    body = "x" * 1000
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([body]), media_type="text/plain")
+
+    @app.get("/plain")
+    def plain():
+        return PlainTextResponse(body)
+
+    client = TestClient(app)
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in streamed.headers
+    assert streamed.text == body
+    assert client.get("/plain", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+
+def test_event_stream_is_excluded():
+    # Resolved from the route, so moving the stream cannot silently put it back behind gzip
+    assert main_app.url_path_for("stream_events") in STREAMING_PATHS
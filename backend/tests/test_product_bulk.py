@@ -0,0 +1,20 @@
+from app.db.models.product import Product
+
+def test_malformed_ids_are_reported_per_row(client, db, auth_headers):
+    rows = [
+        {"name": "Bulk valid", "stock_level": 3, "reorder_threshold": 1},
+        {"id": "abc", "name": "Bulk bad id"},
+        {"id": 1.5, "name": "Bulk fractional id"},
+    ]
+    try:
+        response = client.post("/api/v1/products/bulk?mode=upsert", json=rows, headers=auth_headers)
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["created"] == 1
+        assert result["failed"] == 2
+        assert [(error["index"], error["id"]) for error in result["errors"]] == [(1, None), (2, None)]
+    finally:
+        # Keep the shared database to the seed data the query budgets are measured on
+        db.query(Product).filter(Product.name.like("Bulk %")).delete(synchronize_session=False)
+        db.commit()
@@ -0,0 +1,28 @@
+import pytest
+
+from app.db.query_stats import assert_max_queries
+
+# Queries per request, auth lookup included. These must not grow with the
+# number of products: a per-product query would exceed them on the seed data.
+QUERY_BUDGETS = [
+    ("/api/v1/dashboard/", 4),
+    ("/api/v1/products/", 2),
+    ("/api/v1/products/{product_id}", 2),
+    ("/api/v1/forecasts/", 2),
+    ("/api/v1/forecasts/{product_id}", 2),
+    ("/api/v1/alerts/", 2),
+]
+
+@pytest.mark.parametrize("path,budget", QUERY_BUDGETS)
+def test_query_budget(client, auth_headers, seeded, path, budget):
+    # Built outside the count: reading an expired seed row refreshes it
+    url = path.format(product_id=seeded[0].id)
+    with assert_max_queries(budget):
+        response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()
+
+def test_assert_max_queries_reports_statements(client, auth_headers, seeded):
+    with pytest.raises(AssertionError, match="Expected at most 0 queries"):
+        with assert_max_queries(0):
+            client.get("/api/v1/products/", headers=auth_headers)
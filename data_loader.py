@@ -1,11 +1,152 @@
-
 import pandas as pd
+import hashlib
+import json
 import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+# Bump when the parsing logic changes so cached sheets are re-parsed
+PARSER_VERSION = "2"
+
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Workbook parts every sheet depends on: shared strings hold the cell text
+# and styles decide which numbers are dates
+SHARED_PARTS = ("xl/sharedStrings.xml", "xl/styles.xml")
+
+def file_hash(path):
+    """SHA-256 of the file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def sheet_hashes(excel_path):
+    """
+    Content hash per sheet, from the sheet's XML part plus the shared parts,
+    so an edit to one sheet only invalidates that sheet.
+    """
+    with zipfile.ZipFile(excel_path) as workbook:
+        names = set(workbook.namelist())
+        rels = ET.fromstring(workbook.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{PACKAGE_REL_NS}Relationship")}
+
+        shared = hashlib.sha256(PARSER_VERSION.encode())
+        for part in SHARED_PARTS:
+            if part in names:
+                shared.update(workbook.read(part))
+
+        hashes = {}
+        for sheet in ET.fromstring(workbook.read("xl/workbook.xml")).iter(f"{SPREADSHEET_NS}sheet"):
+            target = targets[sheet.get(f"{RELATIONSHIP_NS}id")]
+            part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            digest = shared.copy()
+            digest.update(workbook.read(part))
+            hashes[sheet.get("name")] = digest.hexdigest()
+    return hashes
+
+def _to_number(values):
+    """Numeric cell values; percentages stored as text ("100%") become fractions"""
+    text = values.astype(str).str.strip()
+    percent = text.str.endswith("%")
+    numbers = pd.to_numeric(values.where(~percent), errors="coerce")
+    numbers[percent] = pd.to_numeric(text[percent].str.rstrip("%"), errors="coerce") / 100
+    return numbers
 
-def load_and_clean_data(excel_path, output_csv_path):
+def parse_sheet(excel_path, sheet_name):
     """
-    Reads an Excel file, reshapes it, cleans NaN values, parses dates,
-    and saves the cleaned data to a CSV file.
+    Parse one sheet into a long table of (sheet, series, type, date, value).
+    A sheet holds blocks separated by blank rows; each block starts with a
+    header row naming the series (the column header for the first block)
+    followed by one row per type with a value per date column.
+    """
+    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    if df.empty:
+        return pd.DataFrame(columns=["sheet", "series", "type", "date", "value"])
+
+    label = df.iloc[:, 0]
+    blank = df.isna().all(axis=1)
+    block_start = blank.shift(fill_value=False) & label.notna()
+    df.insert(0, "series", label.where(block_start).ffill().fillna(str(df.columns[0])))
+    df = df[~blank & ~block_start]
+
+    id_column = df.columns[1]
+    date_columns = df.columns[2:].tolist()
+    df_long = df.melt(id_vars=["series", id_column], value_vars=date_columns, var_name="date", value_name="value")
+    df_long.rename(columns={id_column: "type"}, inplace=True)
+
+    df_long["value"] = _to_number(df_long["value"])
+    df_long.dropna(subset=["value"], inplace=True)
+    df_long["date"] = pd.to_datetime(df_long["date"], errors="coerce")
+    df_long.dropna(subset=["date"], inplace=True)
+
+    df_long.insert(0, "sheet", sheet_name)
+    return df_long.reset_index(drop=True)
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, f"sheet-{digest}.pkl")
+
+def _parse_sheet_task(task):
+    return parse_sheet(*task)
+
+def load_workbook_long(excel_path, cache_dir, workers=None):
+    """
+    Parse every sheet of the workbook into one long table, in parallel.
+    Parsed sheets are cached in cache_dir keyed by content hash: an unchanged
+    workbook is loaded from the cache without opening it, and a changed one
+    only re-parses the sheets whose content differs.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    workbook_hash = file_hash(excel_path)
+    if manifest.get("file_hash") == workbook_hash and manifest.get("parser_version") == PARSER_VERSION:
+        hashes = manifest["sheets"]
+    else:
+        hashes = sheet_hashes(excel_path)
+
+    stale = [name for name, digest in hashes.items() if not os.path.exists(_cache_path(cache_dir, digest))]
+    print(f"Workbook sheets: {len(hashes)} total, {len(stale)} to parse, {len(hashes) - len(stale)} cached")
+
+    if stale:
+        tasks = [(excel_path, name) for name in stale]
+        if len(tasks) == 1:
+            parsed = [_parse_sheet_task(tasks[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(tasks), workers or os.cpu_count() or 1)) as pool:
+                parsed = list(pool.map(_parse_sheet_task, tasks))
+        for name, df_sheet in zip(stale, parsed):
+            df_sheet.to_pickle(_cache_path(cache_dir, hashes[name]))
+
+    # Drop cached sheets no longer referenced by the workbook
+    keep = {os.path.basename(_cache_path(cache_dir, digest)) for digest in hashes.values()}
+    for entry in os.listdir(cache_dir):
+        if entry.startswith("sheet-") and entry not in keep:
+            os.remove(os.path.join(cache_dir, entry))
+
+    with open(manifest_path, "w") as f:
+        json.dump({"file_hash": workbook_hash, "parser_version": PARSER_VERSION, "sheets": hashes}, f)
+
+    frames = [pd.read_pickle(_cache_path(cache_dir, digest)) for digest in hashes.values()]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["sheet", "series", "type", "date", "value"]
+    )
+
+def load_and_clean_data(excel_path, output_csv_path, cache_dir=None):
+    """
+    Reads all sheets of an Excel file into one long (sheet, series, type,
+    date, value) table, drops empty values and unparseable dates, and saves
+    the cleaned data to a CSV file. Parsed sheets are cached under
+    <output dir>/.cache unless cache_dir is given.
     """
     print(f"Current working directory: {os.getcwd()}")
     print(f"Attempting to read Excel file from: {excel_path}")
@@ -13,32 +154,13 @@ def load_and_clean_data(excel_path, output_csv_path):
         print(f"Error: File does not exist at {excel_path}")
         return
 
+    cache_dir = cache_dir or os.path.join(os.path.dirname(output_csv_path), ".cache")
     try:
-        df = pd.read_excel(excel_path)
+        df_long = load_workbook_long(excel_path, cache_dir)
     except Exception as e:
         print(f"Error reading Excel file: {e}")
         return
 
-    # The first column is the product identifier, and the rest are dates
-    # We need to melt the DataFrame using the first column as id_vars
-    # and the date columns as value_vars
-    id_column = df.columns[0]
-    date_columns = df.columns[1:].tolist()
-
-    df_long = df.melt(id_vars=[id_column], value_vars=date_columns, var_name="date", value_name="value")
-
-    # Rename the id_column to 'type' as per the requirement
-    df_long.rename(columns={id_column: 'type'}, inplace=True)
-
-    # Clean NaN values (e.g., from empty cells in Excel)
-    df_long.dropna(subset=["value"], inplace=True)
-
-    # Parse "date" as datetime
-    df_long["date"] = pd.to_datetime(df_long["date"], errors="coerce")
-
-    # Handle any remaining NaT values after coercion
-    df_long.dropna(subset=["date"], inplace=True)
-
     # Save to CSV
     try:
         # Ensure the directory exists
@@ -52,5 +174,3 @@ if __name__ == "__main__":
     excel_file = "/home/ubuntu/Resupply-forecast-app/arkeos_data.xlsx"
     output_csv = "/home/ubuntu/Resupply-forecast-app/data/cleaned_data.csv"
     load_and_clean_data(excel_file, output_csv)
-
-
@@ -13,6 +13,10 @@ const api = axios.create({
   },
 });
 
+// After a write the backend answers with X-Read-Primary-Seconds: for that long, reads
+// ask for the primary database (X-Read-Primary) so replica lag never hides the change
+let readPrimaryUntil = 0;
+
 // Add request interceptor to include auth token
 api.interceptors.request.use(
   (config) => {
@@ -20,6 +24,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (Date.now() < readPrimaryUntil) {
+      config.headers['X-Read-Primary'] = '1';
+    }
     return config;
   },
   (error) => Promise.reject(error)
@@ -27,7 +34,13 @@ api.interceptors.request.use(
 
 // Add response interceptor for handling common errors (e.g., 401 Unauthorized)
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const readPrimarySeconds = Number(response.headers['x-read-primary-seconds']);
+    if (readPrimarySeconds > 0) {
+      readPrimaryUntil = Date.now() + readPrimarySeconds * 1000;
+    }
+    return response;
+  },
   (error) => {
     if (error.response && error.response.status === 401) {
       // Handle unauthorized access, e.g., redirect to login
@@ -164,5 +177,14 @@ export const alertsAPI = {
   },
 };
 
+// Dashboard API
+export const dashboardAPI = {
+  // Stock, forecast total, days of cover and open alerts for every product in one call
+  getSummary: async (params = {}) => {
+    const response = await api.get('/dashboard/', { params });
+    return response.data;
+  },
+};
+
 export default api;
 
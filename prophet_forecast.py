@@ -1,8 +1,11 @@
 
 import pandas as pd
 from prophet import Prophet
+import argparse
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 
 def run_prophet_forecast(input_csv_path, output_json_path):
     """
@@ -46,9 +49,96 @@ def run_prophet_forecast(input_csv_path, output_json_path):
     except Exception as e:
         print(f"Error saving forecast to JSON: {e}")
 
+def _forecast_series(task):
+    """Fit one series in a worker process; same model settings as run_prophet_forecast"""
+    key, history, periods, freq = task
+    try:
+        model = Prophet()
+        model.fit(history)
+        future = model.make_future_dataframe(periods=periods, freq=freq)
+        forecast = model.predict(future)
+        return key, {
+            "ds": forecast["ds"].dt.strftime("%Y-%m-%d").tolist(),
+            "yhat": forecast["yhat"].round(4).tolist(),
+        }, None
+    except Exception as e:
+        return key, None, str(e)
+
+def run_batch_forecast(input_csv_path, output_json_path, types=None, by_series=False, periods=12, freq='M', workers=None):
+    """
+    Forecasts every row type (or the given types) of the cleaned data in
+    parallel worker processes and saves all of them to one compact JSON file.
+    With by_series, each (series, type) pair of the workbook is its own series.
+    Each entry holds its key fields and column arrays "ds" and "yhat".
+    """
+    try:
+        df = pd.read_csv(input_csv_path)
+    except FileNotFoundError:
+        print(f"Error: Cleaned data CSV not found at {input_csv_path}")
+        return
+    except Exception as e:
+        print(f"Error reading cleaned data CSV: {e}")
+        return
+
+    key_columns = ["series", "type"] if by_series else ["type"]
+    if types:
+        df = df[df["type"].isin(types)]
+    df = df.dropna(subset=["value"])
+    df["ds"] = pd.to_datetime(df["date"])
+    df["y"] = df["value"]
+
+    tasks = []
+    for key, group in df.groupby(key_columns, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        if group["ds"].nunique() < 2:
+            print(f"Skipping {' / '.join(map(str, key))}: not enough data points")
+            continue
+        tasks.append((key, group[["ds", "y"]].reset_index(drop=True), periods, freq))
+    if not tasks:
+        print("No series to forecast.")
+        return
+
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    print(f"Forecasting {len(tasks)} series with {workers} workers")
+    series, failed = [], 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for key, forecast, error in pool.map(_forecast_series, tasks, chunksize=max(1, len(tasks) // (workers * 4))):
+            if error:
+                failed += 1
+                print(f"Error forecasting {' / '.join(map(str, key))}: {error}")
+                continue
+            series.append({**dict(zip(key_columns, key)), **forecast})
+
+    output = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "key": key_columns,
+        "periods": periods,
+        "series": series,
+    }
+    try:
+        tmp_path = f"{output_json_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(output, f, separators=(",", ":"))
+        os.replace(tmp_path, output_json_path)
+        print(f"Forecasts for {len(series)} series ({failed} failed) saved to {output_json_path}")
+    except Exception as e:
+        print(f"Error saving forecasts to JSON: {e}")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prophet forecasts from the cleaned workbook data")
+    parser.add_argument("--batch", action="store_true", help="Forecast every type in parallel into one file")
+    parser.add_argument("--types", nargs="+", help="Types to forecast in batch mode (default: all)")
+    parser.add_argument("--by-series", action="store_true", help="Forecast each (series, type) pair separately")
+    parser.add_argument("--freq", default="M", help="Forecast frequency in batch mode (pandas offset alias)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default="data/forecasts.json")
+    args = parser.parse_args()
+
     input_csv = "data/cleaned_data.csv"
-    output_json = "data/forecast.json"
-    run_prophet_forecast(input_csv, output_json)
+    if args.batch:
+        run_batch_forecast(input_csv, args.output, args.types, args.by_series, freq=args.freq, workers=args.workers)
+    else:
+        output_json = "data/forecast.json"
+        run_prophet_forecast(input_csv, output_json)
 
 
@@ -4,16 +4,11 @@ import { Alert, AlertDescription } from "@/components/ui/alert";
 import { Progress } from "@/components/ui/progress";
 import { Badge } from "@/components/ui/badge";
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, LineChart, Line } from "recharts";
-import { Package, TrendingUp, AlertTriangle, DollarSign } from "lucide-react";
-
-// Mock data for dashboard
-const mockStockData = [
-  { name: 'Laptops', current: 45, threshold: 20, forecast: 15 },
-  { name: 'Monitors', current: 12, threshold: 25, forecast: 8 },
-  { name: 'Keyboards', current: 67, threshold: 30, forecast: 45 },
-  { name: 'Mice', current: 23, threshold: 15, forecast: 12 },
-];
+import { Package, TrendingUp, AlertTriangle, Bell } from "lucide-react";
+import { useQuery } from "@tanstack/react-query";
+import { dashboardAPI } from "@/services/api";
 
+// Mock data for the sales chart (not part of the dashboard summary)
 const mockSalesData = [
   { month: 'Jan', sales: 4000, forecast: 3800 },
   { month: 'Feb', sales: 3000, forecast: 3200 },
@@ -24,12 +19,24 @@ const mockSalesData = [
 ];
 
 export function Dashboard() {
-  const totalProducts = 156;
-  const lowStockItems = 8;
-  const forecastAccuracy = 94.2;
-  const totalValue = 125000;
+  // Every product's stock, forecast and open alerts in a single request
+  const { data: summary, isLoading, isError } = useQuery({
+    queryKey: ['dashboard-summary'],
+    queryFn: () => dashboardAPI.getSummary(),
+  });
 
-  const criticalItems = mockStockData.filter(item => item.current <= item.threshold);
+  const stockData = (summary?.products ?? []).map((product) => ({
+    id: product.product_id,
+    name: product.name,
+    current: product.stock_level,
+    threshold: product.reorder_threshold,
+    forecast: product.forecast_total,
+  }));
+  const totalProducts = stockData.length;
+  const criticalItems = stockData.filter(item => item.current <= item.threshold);
+  const lowStockItems = criticalItems.length;
+  const openAlerts = (summary?.products ?? []).reduce((total, product) => total + product.open_alerts, 0);
+  const forecastDemand = stockData.reduce((total, item) => total + item.forecast, 0);
 
   return (
     <div className="space-y-6">
@@ -40,6 +47,13 @@ export function Dashboard() {
         </p>
       </div>
 
+      {isError && (
+        <Alert variant="destructive">
+          <AlertTriangle className="h-4 w-4" />
+          <AlertDescription>Could not load the dashboard summary.</AlertDescription>
+        </Alert>
+      )}
+
       {/* Key Metrics */}
       <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-4">
         <Card>
@@ -48,8 +62,8 @@ export function Dashboard() {
             <Package className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">{totalProducts}</div>
-            <p className="text-xs text-muted-foreground">+12% from last month</p>
+            <div className="text-2xl font-bold">{isLoading ? '-' : totalProducts}</div>
+            <p className="text-xs text-muted-foreground">In the catalog</p>
           </CardContent>
         </Card>
 
@@ -59,30 +73,30 @@ export function Dashboard() {
             <AlertTriangle className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold text-orange-600">{lowStockItems}</div>
+            <div className="text-2xl font-bold text-orange-600">{isLoading ? '-' : lowStockItems}</div>
             <p className="text-xs text-muted-foreground">Requires attention</p>
           </CardContent>
         </Card>
 
         <Card>
           <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-            <CardTitle className="text-sm font-medium">Forecast Accuracy</CardTitle>
+            <CardTitle className="text-sm font-medium">Forecast Demand</CardTitle>
             <TrendingUp className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold text-green-600">{forecastAccuracy}%</div>
-            <p className="text-xs text-muted-foreground">+2.1% from last month</p>
+            <div className="text-2xl font-bold text-green-600">{isLoading ? '-' : Math.round(forecastDemand).toLocaleString()}</div>
+            <p className="text-xs text-muted-foreground">Units over each product's alert horizon</p>
           </CardContent>
         </Card>
 
         <Card>
           <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-            <CardTitle className="text-sm font-medium">Inventory Value</CardTitle>
-            <DollarSign className="h-4 w-4 text-muted-foreground" />
+            <CardTitle className="text-sm font-medium">Open Alerts</CardTitle>
+            <Bell className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">${totalValue.toLocaleString()}</div>
-            <p className="text-xs text-muted-foreground">+5.2% from last month</p>
+            <div className="text-2xl font-bold">{isLoading ? '-' : openAlerts}</div>
+            <p className="text-xs text-muted-foreground">New or acknowledged</p>
           </CardContent>
         </Card>
       </div>
@@ -108,7 +122,7 @@ export function Dashboard() {
           </CardHeader>
           <CardContent>
             <ResponsiveContainer width="100%" height={300}>
-              <BarChart data={mockStockData}>
+              <BarChart data={stockData}>
                 <CartesianGrid strokeDasharray="3 3" />
                 <XAxis dataKey="name" />
                 <YAxis />
@@ -153,8 +167,8 @@ export function Dashboard() {
         </CardHeader>
         <CardContent>
           <div className="space-y-4">
-            {mockStockData.map((item) => (
-              <div key={item.name} className="flex items-center justify-between">
+            {stockData.map((item) => (
+              <div key={item.id} className="flex items-center justify-between">
                 <div className="flex items-center space-x-4">
                   <div className="min-w-0 flex-1">
                     <p className="text-sm font-medium">{item.name}</p>
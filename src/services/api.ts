@@ -0,0 +1,42 @@
+// Same API URL and token key as frontend/src/services/api.ts
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
+
+export interface ProductSummary {
+  product_id: number;
+  name: string;
+  category: string | null;
+  stock_level: number;
+  reorder_threshold: number;
+  horizon_days: number;
+  forecast_total: number;
+  days_of_cover: number | null;
+  open_alerts: number;
+}
+
+export interface DashboardSummary {
+  horizon_days: number | null;
+  generated_at: string;
+  products: ProductSummary[];
+}
+
+async function get<T>(path: string, params: Record<string, string | number | undefined> = {}): Promise<T> {
+  const url = new URL(`${API_URL}${path}`);
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined) url.searchParams.set(key, String(value));
+  });
+  const token = localStorage.getItem('authToken');
+  const response = await fetch(url, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+  });
+  if (!response.ok) {
+    throw new Error(`GET ${path} failed with status ${response.status}`);
+  }
+  return response.json();
+}
+
+// Dashboard API
+export const dashboardAPI = {
+  // Stock, forecast total, days of cover and open alerts for every product in one call
+  getSummary: (params: { horizon_days?: number; category?: string } = {}) =>
+    get<DashboardSummary>('/dashboard/', params),
+};
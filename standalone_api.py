@@ -1,16 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 import pandas as pd
 from prophet import Prophet
+import gzip
 import json
+import orjson
 import os
 import sys
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (compact and much faster on large lists)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
 
 app = FastAPI(
     title="Prophet Forecast API",
     description="Simple API for Prophet forecasting",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS
@@ -22,65 +34,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses above 1 KB; the forecast file is served pre-compressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 @app.get("/")
 def root():
     return {"message": "Welcome to the Prophet Forecast API"}
 
+# Paths to the cleaned input data and the generated forecast
+FORECAST_PATH = "data/forecast.json"
+INPUT_CSV = "data/cleaned_data.csv"
+
+# Only one Prophet fit may run at a time; other callers wait for its result
+_generation_lock = threading.Lock()
+
+# Serialized forecast (raw and gzipped) kept in memory, reloaded when the file's mtime changes
+_cache_lock = threading.Lock()
+_cached_forecast: Optional[bytes] = None
+_cached_forecast_gzip: Optional[bytes] = None
+_cached_mtime: Optional[int] = None
+
+def generate_forecast_file():
+    """
+    Fit Prophet on the cleaned data and write the forecast JSON file.
+    Concurrent callers are serialized and skip the fit if another caller
+    already produced the file while they were waiting.
+    """
+    with _generation_lock:
+        if os.path.exists(FORECAST_PATH):
+            return
+
+        # Check if input CSV exists
+        if not os.path.exists(INPUT_CSV):
+            raise FileNotFoundError(
+                "Cleaned data CSV not found. Please run data_loader.py first."
+            )
+
+        # Read the CSV
+        df = pd.read_csv(INPUT_CSV)
+
+        # Filter for 'Actual sales'
+        df_actual_sales = df[df["type"] == "Actual sales"].copy()
+
+        # Prepare DataFrame for Prophet
+        df_actual_sales["ds"] = pd.to_datetime(df_actual_sales["date"])
+        df_actual_sales["y"] = df_actual_sales["value"]
+
+        # Train Prophet model
+        model = Prophet()
+        model.fit(df_actual_sales)
+
+        # Create future DataFrame for 12 months
+        future = model.make_future_dataframe(periods=12, freq='M')
+
+        # Forecast
+        forecast = model.predict(future)
+
+        # Extract relevant columns and convert to JSON
+        forecast_output = forecast[["ds", "yhat"]].copy()
+        forecast_output["ds"] = forecast_output["ds"].dt.strftime("%Y-%m-%d")
+
+        # Write to a temporary file first so readers never see a partial file
+        tmp_path = f"{FORECAST_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(forecast_output.to_dict(orient="records"), f, separators=(",", ":"))
+        os.replace(tmp_path, FORECAST_PATH)
+
+def load_forecast_bytes(compressed: bool = False) -> bytes:
+    """
+    Return the serialized forecast, re-reading the file only when it changed.
+    The file is re-encoded as compact JSON once per change (files written by
+    older scripts are indented), and a gzipped copy is kept alongside.
+    """
+    global _cached_forecast, _cached_forecast_gzip, _cached_mtime
+
+    mtime = os.stat(FORECAST_PATH).st_mtime_ns
+    with _cache_lock:
+        if _cached_forecast is None or _cached_mtime != mtime:
+            with open(FORECAST_PATH, "rb") as f:
+                _cached_forecast = orjson.dumps(orjson.loads(f.read()))
+            _cached_forecast_gzip = gzip.compress(_cached_forecast, compresslevel=6)
+            _cached_mtime = mtime
+        return _cached_forecast_gzip if compressed else _cached_forecast
+
+def _pregenerate_forecast():
+    """Generate and load the forecast in the background so the first request is fast."""
+    try:
+        generate_forecast_file()
+        load_forecast_bytes()
+        print("Prophet forecast ready.")
+    except Exception as e:
+        print(f"Error pre-generating Prophet forecast: {e}")
+
+@app.on_event("startup")
+def startup_event():
+    threading.Thread(target=_pregenerate_forecast, daemon=True).start()
+
 @app.get("/api/v1/forecasts/prophet/forecast", response_model=List[Dict[str, Any]])
-def get_prophet_forecast():
+def get_prophet_forecast(request: Request):
     """
     Get forecast generated by Prophet
     """
     try:
-        # Path to the forecast JSON file
-        forecast_path = "data/forecast.json"
-        
-        # Check if forecast file exists
-        if not os.path.exists(forecast_path):
-            # If not, generate it
-            input_csv = "data/cleaned_data.csv"
-            
-            # Check if input CSV exists
-            if not os.path.exists(input_csv):
-                raise HTTPException(
-                    status_code=404,
-                    detail="Cleaned data CSV not found. Please run data_loader.py first."
-                )
-            
-            # Read the CSV
-            df = pd.read_csv(input_csv)
-            
-            # Filter for 'Actual sales'
-            df_actual_sales = df[df["type"] == "Actual sales"].copy()
-            
-            # Prepare DataFrame for Prophet
-            df_actual_sales["ds"] = pd.to_datetime(df_actual_sales["date"])
-            df_actual_sales["y"] = df_actual_sales["value"]
-            
-            # Train Prophet model
-            model = Prophet()
-            model.fit(df_actual_sales)
-            
-            # Create future DataFrame for 12 months
-            future = model.make_future_dataframe(periods=12, freq='M')
-            
-            # Forecast
-            forecast = model.predict(future)
-            
-            # Extract relevant columns and convert to JSON
-            forecast_output = forecast[["ds", "yhat"]].copy()
-            forecast_output["ds"] = forecast_output["ds"].dt.strftime("%Y-%m-%d")
-            
-            # Save to JSON
-            with open(forecast_path, "w") as f:
-                json.dump(forecast_output.to_dict(orient="records"), f, indent=4)
-        
-        # Read the forecast from the JSON file
-        with open(forecast_path, "r") as f:
-            forecast_data = json.load(f)
-        
-        return forecast_data
-    
+        # Generate the forecast file if it does not exist yet
+        if not os.path.exists(FORECAST_PATH):
+            generate_forecast_file()
+
+        # Serve the precomputed gzip body when the client accepts it
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            return Response(
+                content=load_forecast_bytes(compressed=True),
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        return Response(content=load_forecast_bytes(), media_type="application/json")
+
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         print(f"Error getting Prophet forecast: {e}")
         raise HTTPException(